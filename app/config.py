@@ -28,6 +28,7 @@ class Settings:
     # Server configuration
     PORT: int = int(os.getenv("PORT", "8000"))
     HOST: str = os.getenv("HOST", "0.0.0.0")
+    WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))  # uvicorn worker processes
 
     # API security
     API_KEY: str = os.getenv("API_KEY", "")
@@ -36,6 +37,8 @@ class Settings:
     # Qdrant retry configuration - increased for large collections
     QDRANT_MAX_RETRIES: int = int(os.getenv("QDRANT_MAX_RETRIES", "3"))
     QDRANT_INITIAL_TIMEOUT: int = int(os.getenv("QDRANT_INITIAL_TIMEOUT", "120"))  # 2 minutes per search
+    QDRANT_MAX_CONNECTIONS: int = int(os.getenv("QDRANT_MAX_CONNECTIONS", "100"))  # Shared client pool size
+    QDRANT_MAX_CONCURRENCY: int = int(os.getenv("QDRANT_MAX_CONCURRENCY", "32"))  # In-flight Qdrant requests per process
 
     # LangChain configuration
     LANGCHAIN_TRACING_V2: bool = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
@@ -51,6 +54,14 @@ class Settings:
     
     # Fast model for simple tasks (query generation, reranking)
     FAST_MODEL: str = os.getenv("FAST_MODEL", "openai/gpt-5-nano")  # Ultra-fast for simple tasks
+    # Route simple questions over few cases to FAST_MODEL for the answer (opt-in)
+    ENABLE_ANSWER_ROUTING: bool = os.getenv("ENABLE_ANSWER_ROUTING", "false").lower() == "true"
+    ANSWER_ROUTING_MAX_CASES: int = int(os.getenv("ANSWER_ROUTING_MAX_CASES", "3"))
+    ANSWER_ROUTING_MAX_WORDS: int = int(os.getenv("ANSWER_ROUTING_MAX_WORDS", "20"))
+    # Summarize lower-ranked cases with FAST_MODEL before the answer call (opt-in)
+    ENABLE_CASE_SUMMARIES: bool = os.getenv("ENABLE_CASE_SUMMARIES", "false").lower() == "true"
+    CASE_SUMMARY_KEEP_FULL: int = int(os.getenv("CASE_SUMMARY_KEEP_FULL", "5"))  # Top cases sent in full
+    CASE_SUMMARY_MAX_TOKENS: int = int(os.getenv("CASE_SUMMARY_MAX_TOKENS", "200"))  # Cap per summary
     
     # Reranking model (for quality improvement)
     RERANK_MODEL: str = os.getenv("RERANK_MODEL", "openai/gpt-5-nano")
@@ -59,11 +70,24 @@ class Settings:
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
     SEZNAM_EMBEDDING_MODEL: str = os.getenv("SEZNAM_EMBEDDING_MODEL", "Seznam/retromae-small-cs")
     SEZNAM_VECTOR_SIZE: int = 256
+    # Embedding backend for EMBEDDING_MODEL: "huggingface" (FP32) or "onnx" (INT8, see export_onnx_embedding)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "huggingface")
+    ONNX_MODEL_DIR: str = os.getenv("ONNX_MODEL_DIR", "onnx_model")
+    ONNX_MODEL_FILE: str = os.getenv("ONNX_MODEL_FILE", "model_int8.onnx")
+    EMBEDDING_DEVICE: str = os.getenv("EMBEDDING_DEVICE", "auto")  # "auto" (CUDA if available), "cuda" or "cpu"
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))  # Cached vectors (LRU)
 
     # e-Sbírka API configuration (Official REST API)
     # API requires registration: https://opendata.eselpoint.cz/dokumentace/Zadost%20o%20registraci%20klienta.pdf
     ESBIRKA_API_KEY: str = os.getenv("ESBIRKA_API_KEY", "")
     ESBIRKA_API_BASE_URL: str = "https://api.e-sbirka.cz"  # Official API base URL
+    ESBIRKA_CACHE_TTL: float = float(os.getenv("ESBIRKA_CACHE_TTL", "3600"))  # Seconds - law texts change rarely
+    ESBIRKA_LAW_CACHE_SIZE: int = int(os.getenv("ESBIRKA_LAW_CACHE_SIZE", "512"))
+    ESBIRKA_FRAGMENT_CACHE_SIZE: int = int(os.getenv("ESBIRKA_FRAGMENT_CACHE_SIZE", "256"))  # Pages (large payloads)
+    ESBIRKA_PAGE_CONCURRENCY: int = int(os.getenv("ESBIRKA_PAGE_CONCURRENCY", "8"))  # Fragment pages in flight per law
+    # Optional on-disk cache (requires `diskcache`), survives restarts; empty = disabled
+    ESBIRKA_DISK_CACHE_DIR: str = os.getenv("ESBIRKA_DISK_CACHE_DIR", "")
+    ESBIRKA_DISK_CACHE_TTL: float = float(os.getenv("ESBIRKA_DISK_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days
 
     # RAG Pipeline configuration
     NUM_GENERATED_QUERIES: int = 5  # Generate up to 5 query variants (dynamic based on complexity)
@@ -79,6 +103,17 @@ class Settings:
     ENABLE_ENTITY_EXTRACTION: bool = os.getenv("ENABLE_ENTITY_EXTRACTION", "true").lower() == "true"
     ENABLE_DOCUMENT_AGGREGATION: bool = os.getenv("ENABLE_DOCUMENT_AGGREGATION", "true").lower() == "true"
 
+    # Semantic query cache (skips Qdrant for near-duplicate questions)
+    QUERY_CACHE_THRESHOLD: float = float(os.getenv("QUERY_CACHE_THRESHOLD", "0.97"))  # Cosine similarity for a hit
+    QUERY_CACHE_MAX_SIZE: int = int(os.getenv("QUERY_CACHE_MAX_SIZE", "2000"))
+    QUERY_CACHE_TTL: float = float(os.getenv("QUERY_CACHE_TTL", "300"))  # Seconds
+    # Exact per-collection search cache (same query vector + limit)
+    SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "2048"))
+    SEARCH_CACHE_TTL: float = float(os.getenv("SEARCH_CACHE_TTL", "60"))  # Seconds
+    # Exact LLM result cache (generated queries, answers for the same question + cases)
+    LLM_CACHE_MAX_SIZE: int = int(os.getenv("LLM_CACHE_MAX_SIZE", "512"))
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "3600"))  # Seconds
+
     @property
     def qdrant_protocol(self) -> str:
         return "https" if self.QDRANT_HTTPS else "http"
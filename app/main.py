@@ -1,13 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routers import health, legal, search, multi_source, law_search
+from app.services.embedding import embedding_batcher
+from app.services.esbirka_client import esbirka_client
+from app.services.llm import llm_service
+from app.services.multi_source_search import get_configs
+from app.services.qdrant import close_qdrant_client, warmup_qdrant_client
+from app.services.search_coalescer import search_coalescer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    search_coalescer.start()
+    embedding_batcher.start()
+    await warmup_qdrant_client([config.name for config in get_configs().values()])
+    await llm_service.warmup()
+    yield
+    await search_coalescer.stop()
+    await embedding_batcher.stop()
+    # Release pooled connections on shutdown
+    await close_qdrant_client()
+    await esbirka_client.aclose()
+    await llm_service.aclose()
+
 
 app = FastAPI(
     title="Czech Legal Assistant API",
     description="AI-powered legal query system with RAG - Multi-source support",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -82,3 +82,23 @@ class LegalQueryResponse(BaseModel):
     sonar_citations: list[str] = []
     case_based_answer: str
     supporting_cases: list[CaseResult]
+
+
+# SSE event payloads for streaming vector search
+class SearchInfoEvent(BaseModel):
+    type: Literal["search_info"] = "search_info"
+    query: str
+    total_results: int
+
+
+class CaseResultEvent(BaseModel):
+    type: Literal["case_result"] = "case_result"
+    index: int
+    case_number: str
+    court: str
+    relevance_score: float
+
+
+class ErrorEvent(BaseModel):
+    type: Literal["error"] = "error"
+    message: str
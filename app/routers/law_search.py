@@ -228,6 +228,7 @@ async def get_law_full_text(
             "verze_do": law_data.get("effective_to", ""),
             "plny_text": law_data.get("full_text", ""),
             "fragment_count": law_data.get("fragment_count", 0),
+            "neuplny": law_data.get("incomplete", False),  # Some fragment pages could not be fetched
             "fragmenty": [f.model_dump() for f in fragments[:100]],  # Limit to 100 fragments
         })
 
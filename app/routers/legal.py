@@ -3,7 +3,7 @@ Legal Search Router - Legacy endpoints (backward compatible)
 Uses general_courts collection (czech_court_decisions_rag)
 Same quality pipeline as v2
 """
-import json
+import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
@@ -12,9 +12,12 @@ from app.models import CaseSearchResponse, CombinedSearchResponse, QueryRequest,
 from app.security import verify_api_key, verify_api_key_query
 from app.services.llm import llm_service
 from app.services.multi_source_search import DataSource, multi_source_engine
+from app.utils.sse import sse_event
 
 router = APIRouter(tags=["search"])
 
+logger = logging.getLogger(__name__)
+
 
 @router.post("/web-search", response_model=WebSearchResponse)
 async def web_search(request: QueryRequest, api_key_valid: bool = Depends(verify_api_key)):
@@ -38,14 +41,14 @@ async def web_search_stream(
             yield 'data: {"type": "web_search_start"}\n\n'
             async for chunk, final, citations in llm_service.get_sonar_answer_stream(question):
                 if chunk:
-                    yield f"data: {json.dumps({'type': 'web_answer_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'web_answer_chunk', 'content': chunk})
                 elif final is not None:
                     if citations:
-                        yield f"data: {json.dumps({'type': 'web_citations', 'citations': citations})}\n\n"
+                        yield sse_event({'type': 'web_citations', 'citations': citations})
                     break
             yield 'data: {"type": "web_search_end"}\n\n'
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -81,10 +84,7 @@ async def case_search_stream(
 
     async def generate():
         try:
-            print(f"\n{'='*60}")
-            print(f"🎯 LEGACY SEARCH (czech_court_decisions_rag)")
-            print(f"   Question: {question[:80]}...")
-            print(f"{'='*60}")
+            logger.info("Legacy search (czech_court_decisions_rag): %.80s", question)
             
             yield 'data: {"type": "case_search_start"}\n\n'
             
@@ -101,7 +101,7 @@ async def case_search_stream(
             full_answer = ""
             async for chunk in llm_service.answer_based_on_cases_stream(question, cases):
                 full_answer += chunk
-                yield f"data: {json.dumps({'type': 'case_answer_chunk', 'content': chunk})}\n\n"
+                yield sse_event({'type': 'case_answer_chunk', 'content': chunk})
             
             yield 'data: {"type": "gpt_answer_end"}\n\n'
             
@@ -123,14 +123,12 @@ async def case_search_stream(
                     'relevance_score': round(case.relevance_score, 3),
                     'source_url': case.source_url,
                 }
-                yield f"data: {json.dumps(case_data)}\n\n"
+                yield sse_event(case_data)
             
             yield 'data: {"type": "case_search_end"}\n\n'
         except Exception as e:
-            print(f"❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            logger.exception("Legacy search error: %s", e)
+            yield sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -179,11 +177,11 @@ async def combined_search_stream(
             async for chunk, final, citations in llm_service.get_sonar_answer_stream(question):
                 if chunk:
                     web_full += chunk
-                    yield f"data: {json.dumps({'type': 'web_answer_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'web_answer_chunk', 'content': chunk})
                 elif final is not None:
                     web_full = final
                     if citations:
-                        yield f"data: {json.dumps({'type': 'web_citations', 'citations': citations})}\n\n"
+                        yield sse_event({'type': 'web_citations', 'citations': citations})
                     break
             yield 'data: {"type": "web_search_end"}\n\n'
             
@@ -196,25 +194,25 @@ async def combined_search_stream(
             case_full = ""
             async for chunk in llm_service.answer_based_on_cases_stream(question, cases):
                 case_full += chunk
-                yield f"data: {json.dumps({'type': 'case_answer_chunk', 'content': chunk})}\n\n"
+                yield sse_event({'type': 'case_answer_chunk', 'content': chunk})
             yield 'data: {"type": "gpt_answer_end"}\n\n'
             
             # Send cases
             yield 'data: {"type": "cases_start"}\n\n'
             for case in cases:
                 full_text = case.subject or ''
-                yield f"data: {json.dumps({'type': 'case', 'case_number': case.case_number, 'court': case.court, 'full_text': full_text, 'text_length': len(full_text), 'relevance_score': round(case.relevance_score, 3), 'source_url': case.source_url})}\n\n"
+                yield sse_event({'type': 'case', 'case_number': case.case_number, 'court': case.court, 'full_text': full_text, 'text_length': len(full_text), 'relevance_score': round(case.relevance_score, 3), 'source_url': case.source_url})
             yield 'data: {"type": "case_search_end"}\n\n'
             
             # Summary
             if web_full and case_full:
                 yield 'data: {"type": "summary_start"}\n\n'
                 async for chunk in llm_service.generate_summary_stream(question, web_full, case_full):
-                    yield f"data: {json.dumps({'type': 'summary_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'summary_chunk', 'content': chunk})
                 yield 'data: {"type": "summary_end"}\n\n'
             
             yield 'data: {"type": "combined_search_end"}\n\n'
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
@@ -2,7 +2,8 @@
 Multi-Source Search Router - Quality Focused
 Pipeline: Generate queries → Vector search → Cross-encoder rerank → Answer
 """
-import json
+import asyncio
+import logging
 import re
 from typing import List
 
@@ -19,19 +20,24 @@ from app.models import (
 from app.security import verify_api_key, verify_api_key_query
 from app.services.multi_source_search import DataSource, multi_source_engine
 from app.services.llm import llm_service
+from app.utils.sse import sse_event
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v2", tags=["multi-source"])
 
 
+_SOURCE_MAP = {
+    DataSourceEnum.CONSTITUTIONAL_COURT: DataSource.CONSTITUTIONAL_COURT,
+    DataSourceEnum.SUPREME_COURT: DataSource.SUPREME_COURT,
+    DataSourceEnum.SUPREME_ADMIN_COURT: DataSource.SUPREME_ADMIN_COURT,
+    DataSourceEnum.ALL_COURTS: DataSource.ALL_COURTS,
+    DataSourceEnum.GENERAL_COURTS: DataSource.GENERAL_COURTS,
+}
+
+
 def _convert_source(source: DataSourceEnum) -> DataSource:
-    mapping = {
-        DataSourceEnum.CONSTITUTIONAL_COURT: DataSource.CONSTITUTIONAL_COURT,
-        DataSourceEnum.SUPREME_COURT: DataSource.SUPREME_COURT,
-        DataSourceEnum.SUPREME_ADMIN_COURT: DataSource.SUPREME_ADMIN_COURT,
-        DataSourceEnum.ALL_COURTS: DataSource.ALL_COURTS,
-        DataSourceEnum.GENERAL_COURTS: DataSource.GENERAL_COURTS,
-    }
-    return mapping.get(source, DataSource.ALL_COURTS)
+    return _SOURCE_MAP.get(source, DataSource.ALL_COURTS)
 
 
 @router.get("/sources", response_model=List[DataSourceInfo])
@@ -80,22 +86,19 @@ async def case_search_stream(
         try:
             internal_source = _convert_source(source)
             
-            print(f"\n{'='*60}")
-            print(f"🎯 QUALITY SEARCH")
-            print(f"   Question: {question[:80]}...")
-            print(f"{'='*60}")
+            logger.info("Quality search: %.80s", question)
             
-            yield f'data: {json.dumps({"type": "search_start", "source": source.value})}\n\n'
+            yield sse_event({"type": "search_start", "source": source.value})
             
             # Step 1: Generate queries
             yield 'data: {"type": "generating_queries"}\n\n'
             queries = await llm_service.generate_search_queries(question, num_queries=7)
-            yield f'data: {json.dumps({"type": "queries_generated", "count": len(queries)})}\n\n'
+            yield sse_event({"type": "queries_generated", "count": len(queries)})
             
             # Step 2: Search with cross-encoder reranking
             yield 'data: {"type": "searching"}\n\n'
             cases = await multi_source_engine.search(queries, internal_source, limit=top_k)
-            yield f'data: {json.dumps({"type": "cases_found", "count": len(cases)})}\n\n'
+            yield sse_event({"type": "cases_found", "count": len(cases)})
             
             # Step 3: Stream answer
             yield 'data: {"type": "generating_answer"}\n\n'
@@ -103,19 +106,19 @@ async def case_search_stream(
             full_answer = ""
             async for chunk in llm_service.answer_based_on_cases_stream(question, cases):
                 full_answer += chunk
-                yield f"data: {json.dumps({'type': 'answer_chunk', 'content': chunk})}\n\n"
+                yield sse_event({'type': 'answer_chunk', 'content': chunk})
             
             yield 'data: {"type": "answer_complete"}\n\n'
             
             # Send cases with full text (no silent truncation)
             yield 'data: {"type": "cases_start"}\n\n'
-            print(f"\n📤 Sending {len(cases)} cases to frontend:")
+            logger.debug("Sending %d cases to frontend", len(cases))
             for idx, case in enumerate(cases):
                 full_text = case.subject or ''
                 # Preview is truncated but marked
                 preview = full_text[:500] + '...' if len(full_text) > 500 else full_text
                 
-                print(f"   [{idx+1}] {case.case_number}: {len(full_text):,} chars")
+                logger.debug("[%d] %s: %d chars", idx + 1, case.case_number, len(full_text))
                 
                 case_data = {
                     'type': 'case',
@@ -129,15 +132,13 @@ async def case_search_stream(
                     'full_text': full_text,  # Full text, no truncation
                     'text_length': len(full_text),  # So frontend knows if truncated
                 }
-                yield f"data: {json.dumps(case_data)}\n\n"
+                yield sse_event(case_data)
             
             yield 'data: {"type": "search_complete"}\n\n'
             
         except Exception as e:
-            print(f"❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            logger.exception("Quality search error: %s", e)
+            yield sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -148,8 +149,6 @@ async def combined_search(request: QueryRequest, api_key_valid: bool = Depends(v
     try:
         source = _convert_source(request.source)
         
-        import asyncio
-        
         async def do_case_search():
             queries = await llm_service.generate_search_queries(request.question, num_queries=7)
             cases = await multi_source_engine.search(queries, source, limit=request.top_k)
@@ -184,10 +183,7 @@ async def web_search_stream(
 
     async def generate():
         try:
-            print(f"\n{'='*60}")
-            print(f"🌐 WEB SEARCH ONLY")
-            print(f"   Question: {question[:80]}...")
-            print(f"{'='*60}")
+            logger.info("Web search: %.80s", question)
             
             yield 'data: {"type": "web_search_start"}\n\n'
             
@@ -197,24 +193,22 @@ async def web_search_stream(
             async for chunk, final, cites in llm_service.get_sonar_answer_stream(question):
                 if chunk:
                     web_full += chunk
-                    yield f"data: {json.dumps({'type': 'web_answer_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'web_answer_chunk', 'content': chunk})
                 elif final is not None:
                     web_full = final
                     citations = cites or []
                     if citations:
-                        yield f"data: {json.dumps({'type': 'web_citations', 'citations': citations})}\n\n"
+                        yield sse_event({'type': 'web_citations', 'citations': citations})
                     break
             
             yield 'data: {"type": "web_search_complete"}\n\n'
             yield 'data: {"type": "complete"}\n\n'
             
-            print(f"✅ Web search complete: {len(web_full)} chars, {len(citations)} citations")
+            logger.info("Web search complete: %d chars, %d citations", len(web_full), len(citations))
             
         except Exception as e:
-            print(f"❌ Web search error: {e}")
-            import traceback
-            traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            logger.exception("Web search error: %s", e)
+            yield sse_event({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -229,13 +223,19 @@ async def combined_search_stream(
     """Streaming combined search"""
 
     async def generate():
+        case_task = None
         try:
             internal_source = _convert_source(source)
             
-            print(f"\n{'='*60}")
-            print(f"🔄 COMBINED SEARCH")
-            print(f"   Question: {question[:80]}...")
-            print(f"{'='*60}")
+            logger.info("Combined search: %.80s", question)
+            
+            # Case retrieval doesn't depend on the web answer - run it while Sonar streams
+            async def retrieve_cases():
+                queries = await llm_service.generate_search_queries(question, num_queries=7)
+                cases = await multi_source_engine.search(queries, internal_source, limit=top_k)
+                return queries, cases
+            
+            case_task = asyncio.create_task(retrieve_cases())
             
             # Web search
             yield 'data: {"type": "web_search_start"}\n\n'
@@ -244,30 +244,29 @@ async def combined_search_stream(
             async for chunk, final, cites in llm_service.get_sonar_answer_stream(question):
                 if chunk:
                     web_full += chunk
-                    yield f"data: {json.dumps({'type': 'web_answer_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'web_answer_chunk', 'content': chunk})
                 elif final is not None:
                     web_full = final
                     citations = cites or []
                     if citations:
-                        yield f"data: {json.dumps({'type': 'web_citations', 'citations': citations})}\n\n"
+                        yield sse_event({'type': 'web_citations', 'citations': citations})
                     break
             yield 'data: {"type": "web_search_complete"}\n\n'
             
             # Case search
             yield 'data: {"type": "case_search_start"}\n\n'
             yield 'data: {"type": "generating_queries"}\n\n'
-            queries = await llm_service.generate_search_queries(question, num_queries=7)
-            yield f'data: {json.dumps({"type": "queries_generated", "count": len(queries)})}\n\n'
+            queries, cases = await case_task
+            yield sse_event({"type": "queries_generated", "count": len(queries)})
             
             yield 'data: {"type": "searching"}\n\n'
-            cases = await multi_source_engine.search(queries, internal_source, limit=top_k)
-            yield f'data: {json.dumps({"type": "cases_found", "count": len(cases)})}\n\n'
+            yield sse_event({"type": "cases_found", "count": len(cases)})
             
             yield 'data: {"type": "generating_answer"}\n\n'
             case_full = ""
             async for chunk in llm_service.answer_based_on_cases_stream(question, cases):
                 case_full += chunk
-                yield f"data: {json.dumps({'type': 'case_answer_chunk', 'content': chunk})}\n\n"
+                yield sse_event({'type': 'case_answer_chunk', 'content': chunk})
             
             yield 'data: {"type": "case_search_complete"}\n\n'
             
@@ -286,23 +285,25 @@ async def combined_search_stream(
                     'subject': full_text[:500] + '...' if len(full_text) > 500 else full_text,
                     'full_text': full_text,
                 }
-                yield f"data: {json.dumps(case_data)}\n\n"
+                yield sse_event(case_data)
             
             # Summary
             if web_full and case_full:
                 yield 'data: {"type": "summary_start"}\n\n'
                 async for chunk in llm_service.generate_summary_stream(question, web_full, case_full):
-                    yield f"data: {json.dumps({'type': 'summary_chunk', 'content': chunk})}\n\n"
+                    yield sse_event({'type': 'summary_chunk', 'content': chunk})
                 yield 'data: {"type": "summary_complete"}\n\n'
             
             yield 'data: {"type": "complete"}\n\n'
             
-            print(f"✅ Combined search complete")
+            logger.info("Combined search complete")
             
         except Exception as e:
-            print(f"❌ Combined search error: {e}")
-            import traceback
-            traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            logger.exception("Combined search error: %s", e)
+            yield sse_event({'type': 'error', 'message': str(e)})
+        finally:
+            # Client went away (or web search failed) before the cases were needed
+            if case_task is not None and not case_task.done():
+                case_task.cancel()
 
     return StreamingResponse(generate(), media_type="text/event-stream")
@@ -1,46 +1,64 @@
 """
 Search Router - Debug and direct search endpoints
 """
-import json
+import asyncio
+from typing import List, Optional
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
 from app.config import settings
+from app.models import (
+    CaseResultEvent,
+    DataSourceEnum,
+    ErrorEvent,
+    SearchInfoEvent,
+)
 from app.security import verify_api_key, verify_api_key_query
 from app.services.embedding import get_embedding
 from app.services.multi_source_search import DataSource, multi_source_engine
+from app.services.qdrant import get_qdrant_client
+from app.services.query_cache import get_cache_stats
+from app.services.search_coalescer import search_coalescer
+from app.utils.formatters import case_to_dict
 
-router = APIRouter(tags=["search"])
+router = APIRouter(tags=["search"], default_response_class=ORJSONResponse)
 
+# Static SSE frames, built once and reused by every stream
+_SSE_START = ServerSentEvent(data='{"type": "search_start"}')
+_SSE_DONE = ServerSentEvent(data='{"type": "done"}')
+
+# Qdrant paths are constant for the process lifetime (host and api-key live on the shared client)
+_COLLECTIONS_PATH = "/collections"
+_COLLECTION_PATH = f"{_COLLECTIONS_PATH}/{settings.QDRANT_COLLECTION}"
+_SEARCH_PATH = f"{_COLLECTION_PATH}/points/search"
 
 @router.get("/search-cases")
 async def search_cases(
     question: str = Query(..., description="Legal question to search"),
     top_k: int = Query(5, description="Number of cases to retrieve"),
+    sources: Optional[List[DataSourceEnum]] = Query(
+        None, description="Collections to search (default: general_courts)"
+    ),
     api_key_valid: bool = Depends(verify_api_key),
 ):
     """Direct vector search in Qdrant without AI processing"""
     try:
-        cases = await multi_source_engine.search_collection(
-            query=question, source=DataSource.GENERAL_COURTS, limit=top_k
-        )
+        if sources:
+            cases = await multi_source_engine.search_batch(
+                query=question, sources=[DataSource(s.value) for s in sources], limit=top_k
+            )
+        else:
+            # Concurrent requests share one embedding call and one Qdrant batch search
+            cases = await search_coalescer.submit(question, DataSource.GENERAL_COURTS, top_k)
 
-        return {
+        # Return the response directly - skips FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
             "query": question,
             "total_results": len(cases),
-            "cases": [
-                {
-                    "case_number": c.case_number,
-                    "court": c.court,
-                    "subject": c.subject,
-                    "date_issued": c.date_issued,
-                    "relevance_score": round(c.relevance_score, 4),
-                }
-                for c in cases
-            ],
-        }
+            "cases": list(map(case_to_dict, cases)),
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -53,39 +71,45 @@ async def search_cases_stream(
 ):
     """Streaming vector search results"""
 
-    async def generate():
+    async def sse_stream():
+        # Event payloads are serialized by pydantic-core instead of json.dumps
         try:
-            yield 'data: {"type": "search_start"}\n\n'
+            yield _SSE_START
 
             cases = await multi_source_engine.search_collection(
                 query=question, source=DataSource.GENERAL_COURTS, limit=top_k
             )
 
-            yield f"data: {json.dumps({'type': 'search_info', 'query': question, 'total_results': len(cases)})}\n\n"
+            yield ServerSentEvent(
+                data=SearchInfoEvent(query=question, total_results=len(cases)).model_dump_json()
+            )
 
             for i, case in enumerate(cases):
-                yield f"data: {json.dumps({'type': 'case_result', 'index': i + 1, 'case_number': case.case_number, 'court': case.court, 'relevance_score': round(case.relevance_score, 4)})}\n\n"
+                event = CaseResultEvent(
+                    index=i + 1,
+                    case_number=case.case_number,
+                    court=case.court,
+                    relevance_score=round(case.relevance_score, 4),
+                )
+                yield ServerSentEvent(data=event.model_dump_json())
 
-            yield 'data: {"type": "done"}\n\n'
+            yield _SSE_DONE
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield ServerSentEvent(data=ErrorEvent(message=str(e)).model_dump_json())
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return EventSourceResponse(sse_stream(), ping=15)
 
 
 @router.get("/debug/qdrant")
 async def debug_qdrant(api_key_valid: bool = Depends(verify_api_key)):
     """Debug endpoint to verify Qdrant connection"""
-    headers = {"api-key": settings.QDRANT_API_KEY} if settings.QDRANT_API_KEY else {}
-
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{settings.qdrant_url}/collections", headers=headers)
-            return {
-                "status": response.status_code,
-                "url": settings.qdrant_url,
-                "collections": response.json() if response.status_code == 200 else response.text[:500],
-            }
+        response = await get_qdrant_client().get(_COLLECTIONS_PATH)
+        return {
+            "status": response.status_code,
+            "url": settings.qdrant_url,
+            "collections": response.json() if response.status_code == 200 else response.text[:500],
+        }
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
@@ -117,54 +141,73 @@ async def debug_test_search(
     return debug_info
 
 
+@router.get("/debug/cache-stats")
+async def debug_cache_stats(api_key_valid: bool = Depends(verify_api_key)):
+    """Semantic query cache statistics per collection"""
+    return {"caches": get_cache_stats()}
+
+
 @router.get("/debug/qdrant-full")
 async def debug_qdrant_full(api_key_valid: bool = Depends(verify_api_key)):
     """Comprehensive Qdrant diagnostic endpoint"""
-    headers = {"api-key": settings.QDRANT_API_KEY} if settings.QDRANT_API_KEY else {}
+    client = get_qdrant_client()
     results = {"config": {"qdrant_url": settings.qdrant_url, "collection": settings.QDRANT_COLLECTION}, "tests": {}}
 
+    # Connection, collection info and embedding are independent - run them concurrently
+    conn_resp, coll_resp, vector = await asyncio.gather(
+        client.get(_COLLECTIONS_PATH),
+        client.get(_COLLECTION_PATH),
+        get_embedding("rozvod manželství"),
+        return_exceptions=True,
+    )
+
+    failed: List[str] = []
+
     # Test connection
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{settings.qdrant_url}/collections", headers=headers)
-            results["tests"]["connection"] = {"status": "success" if response.status_code == 200 else "failed"}
-    except Exception as e:
-        results["tests"]["connection"] = {"status": "error", "error": str(e)}
+    if isinstance(conn_resp, Exception):
+        results["tests"]["connection"] = {"status": "error", "error": str(conn_resp)}
+        failed.append("connection")
+    elif conn_resp.status_code == 200:
+        results["tests"]["connection"] = {"status": "success"}
+    else:
+        results["tests"]["connection"] = {"status": "failed"}
+        failed.append("connection")
 
     # Test collection
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{settings.qdrant_url}/collections/{settings.QDRANT_COLLECTION}", headers=headers
-            )
-            if response.status_code == 200:
-                info = response.json().get("result", {})
-                results["tests"]["collection"] = {
-                    "status": "success",
-                    "points_count": info.get("points_count", 0),
-                }
-            else:
-                results["tests"]["collection"] = {"status": "failed"}
+        if isinstance(coll_resp, Exception):
+            raise coll_resp
+        if coll_resp.status_code == 200:
+            info = coll_resp.json().get("result", {})
+            results["tests"]["collection"] = {
+                "status": "success",
+                "points_count": info.get("points_count", 0),
+            }
+        else:
+            results["tests"]["collection"] = {"status": "failed"}
+            failed.append("collection")
     except Exception as e:
         results["tests"]["collection"] = {"status": "error", "error": str(e)}
+        failed.append("collection")
 
     # Test search
     try:
-        vector = await get_embedding("rozvod manželství")
+        if isinstance(vector, Exception):
+            raise vector
         if vector:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{settings.qdrant_url}/collections/{settings.QDRANT_COLLECTION}/points/search",
-                    headers=headers,
-                    json={"vector": vector, "limit": 3, "with_payload": True},
-                )
-                if response.status_code == 200:
-                    result_list = response.json().get("result", [])
-                    results["tests"]["search"] = {"status": "success", "results_found": len(result_list)}
-                else:
-                    results["tests"]["search"] = {"status": "failed"}
+            response = await client.post(
+                _SEARCH_PATH,
+                json={"vector": vector, "limit": 3, "with_payload": True},
+            )
+            if response.status_code == 200:
+                result_list = response.json().get("result", [])
+                results["tests"]["search"] = {"status": "success", "results_found": len(result_list)}
+            else:
+                results["tests"]["search"] = {"status": "failed"}
+                failed.append("search")
     except Exception as e:
         results["tests"]["search"] = {"status": "error", "error": str(e)}
+        failed.append("search")
 
-    results["summary"] = {"all_passed": all(t.get("status") == "success" for t in results["tests"].values())}
+    results["summary"] = {"all_passed": not failed, "failed_tests": failed}
     return results
@@ -1,3 +1,5 @@
+import hmac
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -6,41 +8,52 @@ from app.config import settings
 # Define security scheme
 security = HTTPBearer(auto_error=False)
 
+_API_KEY_BYTES = settings.API_KEY.encode()
+
+
+def _invalid_api_key() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing API key",
+    )
+
+
+if not settings.API_KEY:
+    # Skip authentication in development if API key is not set -
+    # decided once at import so requests pay nothing for it
 
-async def verify_api_key(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-):
-    """
-    Verify API key from Authorization header
-    """
-    # Skip authentication in development if API key is not set
-    if not settings.API_KEY:
+    async def verify_api_key():
+        """
+        Verify API key from Authorization header (disabled: no API key configured)
+        """
         return True
 
-    if (
-        not credentials
-        or not credentials.credentials
-        or credentials.credentials != settings.API_KEY
+    async def verify_api_key_query(api_key: str | None = None):
+        """
+        Verify API key from query parameter (disabled: no API key configured)
+        """
+        return True
+
+else:
+
+    async def verify_api_key(
+        credentials: HTTPAuthorizationCredentials = Security(security),
     ):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or missing API key",
-        )
-    return True
-
-
-async def verify_api_key_query(api_key: str | None = None):
-    """
-    Verify API key from query parameter
-    Alternative method for clients that can't easily use Bearer tokens
-    """
-    # Skip authentication in development if API key is not set
-    if not settings.API_KEY:
+        """
+        Verify API key from Authorization header
+        """
+        # Constant-time compare so the key can't be probed via response timing
+        if not credentials or not hmac.compare_digest(
+            credentials.credentials.encode(), _API_KEY_BYTES
+        ):
+            raise _invalid_api_key()
         return True
 
-    if not api_key or api_key != settings.API_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or missing API key",
-        )
-    return True
+    async def verify_api_key_query(api_key: str | None = None):
+        """
+        Verify API key from query parameter
+        Alternative method for clients that can't easily use Bearer tokens
+        """
+        if not api_key or not hmac.compare_digest(api_key.encode(), _API_KEY_BYTES):
+            raise _invalid_api_key()
+        return True
@@ -8,8 +8,8 @@ Usage:
     python -m app.services.create_payload_indexes
 """
 import asyncio
-import httpx
 from app.config import settings
+from app.services.qdrant import get_qdrant_client, close_qdrant_client
 
 
 COLLECTIONS = [
@@ -19,6 +19,8 @@ COLLECTIONS = [
     settings.QDRANT_COLLECTION,
 ]
 
+_INDEX_PATHS = {collection: f"/collections/{collection}/index" for collection in COLLECTIONS}
+
 INDEXES = [
     {"field_name": "case_number", "field_schema": "keyword"},
     {"field_name": "legal_references", "field_schema": "keyword"},
@@ -27,32 +29,43 @@ INDEXES = [
 
 
 async def create_indexes():
-    """Create payload indexes on all collections."""
-    qdrant_url = settings.qdrant_url
-    headers = {"api-key": settings.QDRANT_API_KEY} if settings.QDRANT_API_KEY else {}
+    """Create payload indexes on all collections (all PUTs run concurrently)."""
+    client = get_qdrant_client()
+    sem = asyncio.Semaphore(8)
+    
+    async def _one(collection: str, index: dict):
+        async with sem:
+            return await client.put(
+                _INDEX_PATHS[collection],
+                json=index,
+                timeout=60.0,
+            )
+    
+    jobs = [(collection, index) for collection in COLLECTIONS for index in INDEXES]
+    
+    try:
+        responses = await asyncio.gather(
+            *[_one(collection, index) for collection, index in jobs],
+            return_exceptions=True,
+        )
+    finally:
+        await close_qdrant_client()
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        for collection in COLLECTIONS:
+    current = None
+    for (collection, index), response in zip(jobs, responses):
+        if collection != current:
+            current = collection
             print(f"\n📦 Collection: {collection}")
-            
-            for index in INDEXES:
-                try:
-                    response = await client.put(
-                        f"{qdrant_url}/collections/{collection}/index",
-                        headers=headers,
-                        json=index,
-                    )
-                    
-                    if response.status_code == 200:
-                        print(f"   ✅ Created index: {index['field_name']}")
-                    elif response.status_code == 400:
-                        # Index might already exist
-                        print(f"   ⏭️ Index exists: {index['field_name']}")
-                    else:
-                        print(f"   ❌ Failed: {index['field_name']} - {response.status_code}")
-                        
-                except Exception as e:
-                    print(f"   ❌ Error: {index['field_name']} - {e}")
+        
+        if isinstance(response, Exception):
+            print(f"   ❌ Error: {index['field_name']} - {response}")
+        elif response.status_code == 200:
+            print(f"   ✅ Created index: {index['field_name']}")
+        elif response.status_code == 400:
+            # Index might already exist
+            print(f"   ⏭️ Index exists: {index['field_name']}")
+        else:
+            print(f"   ❌ Failed: {index['field_name']} - {response.status_code}")
     
     print("\n✅ Done!")
 
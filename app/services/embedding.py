@@ -1,48 +1,364 @@
 """
 Embedding Service - LangChain-powered
 Provides embedding generation using HuggingFace models
+(FP32 sentence-transformers, or an INT8-quantized ONNX Runtime export)
 """
-from typing import List, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from app.config import settings
 
-_embedding_model: Optional[HuggingFaceEmbeddings] = None
+logger = logging.getLogger(__name__)
 
+_embedding_model: Optional[Embeddings] = None
+# Models are created from worker threads - make sure only one load happens
+_model_lock = threading.Lock()
 
-def get_embedding_model() -> HuggingFaceEmbeddings:
+# Exact-match LRU of embeddings, keyed by a content hash of model + normalized text.
+# Vectors are stored as float32 arrays (~8x smaller than a list of Python floats).
+_EMBED_CACHE: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+# In-flight misses - concurrent requests for the same text share one computation
+_inflight: Dict[bytes, "asyncio.Future[Optional[List[float]]]"] = {}
+
+
+def _cache_key(text: str, model_name: str = settings.EMBEDDING_MODEL) -> bytes:
+    normalized = text.strip().lower()
+    return hashlib.blake2b(
+        f"{model_name}\0{normalized}".encode(), digest_size=16
+    ).digest()
+
+
+def _cache_get(key: bytes) -> Optional[List[float]]:
+    cached = _EMBED_CACHE.get(key)
+    if cached is None:
+        return None
+    _EMBED_CACHE.move_to_end(key)
+    return cached.tolist()
+
+
+def _cache_put(key: bytes, embedding: List[float]) -> None:
+    _EMBED_CACHE[key] = np.asarray(embedding, dtype=np.float32)
+    if len(_EMBED_CACHE) > settings.EMBEDDING_CACHE_SIZE:
+        _EMBED_CACHE.popitem(last=False)
+
+
+_device: Optional[str] = None
+
+
+def get_device() -> str:
+    """Torch device for the sentence-transformers models (CUDA when available)"""
+    global _device
+
+    if _device is None:
+        if settings.EMBEDDING_DEVICE != "auto":
+            _device = settings.EMBEDDING_DEVICE
+        else:
+            import torch
+
+            _device = "cuda" if torch.cuda.is_available() else "cpu"
+    return _device
+
+
+def get_model_kwargs() -> Dict:
+    """Transformer load kwargs - FP16 weights on GPU, FP32 on CPU"""
+    import torch
+
+    return {"torch_dtype": torch.float16 if get_device() == "cuda" else torch.float32}
+
+
+def _split_cached(
+    texts: List[str], model_name: str
+) -> Tuple[List[bytes], List[Optional[List[float]]], Dict[bytes, str]]:
+    """Look texts up in the LRU; returns keys, hits (None for misses), distinct misses"""
+    keys = [_cache_key(text, model_name) for text in texts]
+    embeddings = [_cache_get(key) for key in keys]
+    misses: Dict[bytes, str] = {}
+    for key, text, embedding in zip(keys, texts, embeddings):
+        if embedding is None and key not in misses:
+            misses[key] = text
+    return keys, embeddings, misses
+
+
+def _merge_encoded(
+    keys: List[bytes],
+    embeddings: List[Optional[List[float]]],
+    misses: Dict[bytes, str],
+    encoded: List[List[float]],
+) -> List[List[float]]:
+    computed = dict(zip(misses, encoded))
+    for key, embedding in computed.items():
+        _cache_put(key, embedding)
+    return [
+        embedding if embedding is not None else computed[key]
+        for key, embedding in zip(keys, embeddings)
+    ]
+
+
+def embed_with_cache(
+    texts: List[str],
+    model_name: str,
+    encode: Callable[[List[str]], List[List[float]]],
+) -> List[List[float]]:
+    """
+    Embed texts through the shared LRU - only texts not seen before
+    (per model) are passed to encode(), each distinct text once.
+    """
+    keys, embeddings, misses = _split_cached(texts, model_name)
+    if not misses:
+        return embeddings
+    return _merge_encoded(keys, embeddings, misses, encode(list(misses.values())))
+
+
+async def aembed_with_cache(
+    texts: List[str],
+    model_name: str,
+    encode: Callable[[List[str]], List[List[float]]],
+) -> List[List[float]]:
+    """
+    Async embed_with_cache - cache lookups stay on the event loop and the
+    misses are encoded in one encode() call in a worker thread.
+    
+    Misses that another request is already encoding are not encoded again:
+    they wait on its in-flight future (shared with get_embedding).
+    """
+    keys, embeddings, misses = _split_cached(texts, model_name)
+    if not misses:
+        return embeddings
+    
+    waiting = {key: _inflight[key] for key in misses if key in _inflight}
+    owned = {key: text for key, text in misses.items() if key not in waiting}
+    
+    loop = asyncio.get_running_loop()
+    futures = {key: loop.create_future() for key in owned}
+    _inflight.update(futures)
+    try:
+        computed: Dict[bytes, Optional[List[float]]] = {}
+        if owned:
+            encoded = await asyncio.to_thread(encode, list(owned.values()))
+            for key, embedding in zip(owned, encoded):
+                _cache_put(key, embedding)
+                futures[key].set_result(embedding)
+                computed[key] = embedding
+        
+        if waiting:
+            await asyncio.wait(waiting.values())
+            for key, future in waiting.items():
+                if not future.cancelled() and future.result() is not None:
+                    computed[key] = future.result()
+            # The other request failed - encode what's still missing ourselves
+            failed = {key: misses[key] for key in waiting if key not in computed}
+            if failed:
+                encoded = await asyncio.to_thread(encode, list(failed.values()))
+                for key, embedding in zip(failed, encoded):
+                    _cache_put(key, embedding)
+                    computed[key] = embedding
+    finally:
+        for key, future in futures.items():
+            if not future.done():
+                future.cancel()
+            del _inflight[key]
+    
+    return [
+        embedding if embedding is not None else computed[key]
+        for key, embedding in zip(keys, embeddings)
+    ]
+
+
+class ONNXEmbeddings(Embeddings):
+    """
+    INT8-quantized ONNX Runtime backend for EMBEDDING_MODEL.
+    Mean pooling + L2 normalization - same vectors as the sentence-transformers model.
+    """
+
+    # paraphrase-multilingual-MiniLM-L12-v2 is trained with max_seq_length=128
+    MAX_LENGTH = 128
+
+    def __init__(self, model_dir: str, file_name: str):
+        # Optional dependency - only needed when EMBEDDING_BACKEND=onnx
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = os.cpu_count() or 1
+
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir,
+            file_name=file_name,
+            provider="CPUExecutionProvider",
+            session_options=options,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        encoded = self._tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.MAX_LENGTH,
+            return_tensors="np",
+        )
+        hidden = self._model(**encoded).last_hidden_state
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def get_embedding_model() -> Embeddings:
     """Get or create the embedding model singleton"""
     global _embedding_model
 
-    if _embedding_model is None:
-        _embedding_model = HuggingFaceEmbeddings(
-            model_name=settings.EMBEDDING_MODEL,
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": False},
-        )
-        print(f"✅ Embedding model loaded: {settings.EMBEDDING_MODEL}")
+    if _embedding_model is not None:
+        return _embedding_model
+
+    with _model_lock:
+        if _embedding_model is not None:
+            return _embedding_model
+
+        if settings.EMBEDDING_BACKEND == "onnx":
+            _embedding_model = ONNXEmbeddings(settings.ONNX_MODEL_DIR, settings.ONNX_MODEL_FILE)
+            logger.debug("Embedding model loaded: %s (ONNX INT8)", settings.EMBEDDING_MODEL)
+        else:
+            import torch
+
+            device = get_device()
+            if device == "cpu":
+                # Split cores between uvicorn workers instead of oversubscribing them
+                torch.set_num_threads(max(1, (os.cpu_count() or 1) // settings.WORKERS))
+            _embedding_model = HuggingFaceEmbeddings(
+                model_name=settings.EMBEDDING_MODEL,
+                model_kwargs={"device": device, "model_kwargs": get_model_kwargs()},
+                # Collections use cosine distance, so unit vectors score identically
+                # and Qdrant doesn't have to renormalize every query
+                encode_kwargs={"normalize_embeddings": True, "convert_to_numpy": True},
+            )
+            logger.debug("Embedding model loaded: %s (%s)", settings.EMBEDDING_MODEL, device)
 
     return _embedding_model
 
 
+class DynamicBatcher:
+    """
+    Coalesces concurrent single-text embedding requests.
+
+    Texts arriving within max_wait of each other are encoded in one
+    forward pass (up to max_batch), sorted by length to minimise padding.
+    """
+
+    def __init__(self, max_batch: int = 32, max_wait: float = 0.005):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._queue = asyncio.Queue()
+            self._runner = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+    async def submit(self, text: str) -> Optional[List[float]]:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch.sort(key=lambda item: len(item[0]))
+            texts = [text for text, _ in batch]
+            try:
+                model = get_embedding_model()
+                embeddings = await asyncio.to_thread(model.embed_documents, texts)
+            except Exception as e:
+                logger.error("Embedding error: %s", e)
+                embeddings = [None] * len(batch)
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+embedding_batcher = DynamicBatcher()
+
+
 async def get_embedding(text: str) -> Optional[List[float]]:
-    """Generate embedding for text"""
+    """Generate embedding for text (cached, single-flight, micro-batched)"""
+    key = _cache_key(text)
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # This request itself was cancelled
+        # The owning request was cancelled (e.g. client disconnect) - encode it ourselves
+        embedding = await embedding_batcher.submit(text)
+        if embedding is not None:
+            _cache_put(key, embedding)
+        return embedding
+
+    future: "asyncio.Future[Optional[List[float]]]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
     try:
-        model = get_embedding_model()
-        embedding = model.embed_query(text)
+        # Encoded together with other concurrent requests, off the event loop
+        embedding = await embedding_batcher.submit(text)
+        if embedding is not None:
+            _cache_put(key, embedding)
+        future.set_result(embedding)
         return embedding
-    except Exception as e:
-        print(f"❌ Embedding error: {e}")
-        return None
+    finally:
+        if not future.done():
+            future.cancel()
+        del _inflight[key]
 
 
 async def get_embeddings_batch(texts: List[str]) -> Optional[List[List[float]]]:
-    """Generate embeddings for multiple texts"""
+    """Generate embeddings for multiple texts (only cache misses are encoded)"""
     try:
-        model = get_embedding_model()
-        embeddings = model.embed_documents(texts)
-        return embeddings
+        return await aembed_with_cache(
+            texts, settings.EMBEDDING_MODEL, lambda misses: get_embedding_model().embed_documents(misses)
+        )
     except Exception as e:
-        print(f"❌ Batch embedding error: {e}")
+        logger.error("Batch embedding error: %s", e)
         return None
@@ -3,19 +3,77 @@ e-Sbírka REST API Client
 Production client for Czech legal database search using official e-Sbírka API
 API Documentation: https://api.e-sbirka.cz
 """
+import asyncio
+import certifi
 import httpx
+import orjson
 import re
+import ssl
 from urllib.parse import quote
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 import logging
 
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Official e-Sbírka API base URL
 ESBIRKA_API_BASE = "https://api.e-sbirka.cz"
 
+# Built once - verified TLS without re-reading the CA bundle per client
+_SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Fragments are stripped in one pass over a sentinel-joined buffer;
+# tags may not span the sentinel so fragments can't bleed into each other
+_FRAGMENT_SEP = "\x01"
+_HTML_TAG_BATCH_RE = re.compile(r'<[^>\x01]+>')
+
+# Law type keywords, checked in priority order ("zákon" also covers "zákoník")
+_LAW_TYPES = (
+    ("zákon", "Zákon"),
+    ("nařízení", "Nařízení"),
+    ("vyhláška", "Vyhláška"),
+    ("sdělení", "Sdělení"),
+    ("usnesení", "Usnesení"),
+)
+
+# Year in a citation, e.g. "262/2006 Sb." -> 2006
+_YEAR_RE = re.compile(r'/(\d{4})')
+
+# Longest Retry-After we are willing to wait inside a request
+_MAX_RETRY_AFTER = 10.0
+# Full jitter - clients throttled together don't come back in lockstep
+_BACKOFF = wait_random_exponential(multiplier=0.5, max=8)
+
+
+class _RetryableStatus(Exception):
+    """429/5xx response - retried, then handed back to the caller"""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Honor the server's Retry-After on 429/503, otherwise jittered backoff"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, _RetryableStatus):
+        retry_after = exc.response.headers.get("Retry-After")
+        try:
+            return min(float(retry_after), _MAX_RETRY_AFTER)
+        except (TypeError, ValueError):
+            pass
+    return _BACKOFF(retry_state)
+
 
 class ESbirkaAPIClient:
     """Official e-Sbírka REST API client"""
@@ -24,11 +82,69 @@ class ESbirkaAPIClient:
         self.api_key = settings.ESBIRKA_API_KEY
         self.base_url = ESBIRKA_API_BASE
         self.timeout = 60.0
+        self._client: Optional[httpx.AsyncClient] = None
+        # Laws are versioned by staleUrl - details and fragment pages are safe to reuse
+        self._law_cache = TTLCache(settings.ESBIRKA_LAW_CACHE_SIZE, settings.ESBIRKA_CACHE_TTL)
+        self._fragments_cache = TTLCache(settings.ESBIRKA_FRAGMENT_CACHE_SIZE, settings.ESBIRKA_CACHE_TTL)
+        self._disk_cache = None  # diskcache.Cache, opened on first use
         
         logger.info(f"e-Sbírka client initialized")
         logger.info(f"  Base URL: {self.base_url}")
         logger.info(f"  API Key configured: {'Yes' if self.api_key else 'No'}")
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client - one TLS handshake reused across all API calls"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                verify=_SSL_CTX,
+                http2=True,
+                # Keep idle connections around between user questions (default is 5s)
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60),
+                headers=self._get_headers(),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and disk cache (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def _get_disk_cache(self):
+        """On-disk cache shared by restarts, or None when ESBIRKA_DISK_CACHE_DIR is unset"""
+        if self._disk_cache is None and settings.ESBIRKA_DISK_CACHE_DIR:
+            # Optional dependency - only needed when the disk cache is enabled
+            import diskcache
+            
+            self._disk_cache = diskcache.Cache(settings.ESBIRKA_DISK_CACHE_DIR)
+        return self._disk_cache
+
+    async def _disk_get(self, key: str) -> Optional[Any]:
+        cache = self._get_disk_cache()
+        if cache is None:
+            return None
+        try:
+            raw = await asyncio.to_thread(cache.get, key)
+            return orjson.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"[e-Sbírka] Disk cache read failed: {e}")
+            return None
+
+    async def _disk_put(self, key: str, value: Any) -> None:
+        cache = self._get_disk_cache()
+        if cache is None:
+            return
+        try:
+            await asyncio.to_thread(
+                cache.set, key, orjson.dumps(value), expire=settings.ESBIRKA_DISK_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"[e-Sbírka] Disk cache write failed: {e}")
+
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with official e-Sbírka auth header"""
         headers = {
@@ -41,11 +157,36 @@ class ESbirkaAPIClient:
             headers["esel-api-access-key"] = self.api_key
         return headers
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=_wait_retry_after,
+        retry=retry_if_exception_type((httpx.TransportError, _RetryableStatus)),
+        reraise=True,
+    )
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self._get_client().request(method, url, **kwargs)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise _RetryableStatus(response)
+        return response
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared client, retrying transport errors
+        and 429/5xx responses (up to 3 attempts).
+        
+        If every attempt is throttled or fails server-side, the last
+        response is returned so callers keep their own status handling.
+        """
+        try:
+            return await self._send(method, url, **kwargs)
+        except _RetryableStatus as e:
+            return e.response
+
     def _strip_html(self, text: str) -> str:
         """Remove HTML tags from text"""
         if not text:
             return ""
-        return re.sub(r'<[^>]+>', '', text)
+        return _HTML_TAG_RE.sub('', text)
 
     async def search_laws(
         self,
@@ -88,82 +229,80 @@ class ESbirkaAPIClient:
         logger.info(f"  API Key: {'***' if self.api_key else 'None'}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-                response = await client.post(
-                    url, 
-                    json=payload, 
-                    headers=self._get_headers()
-                )
-                
-                logger.info(f"[e-Sbírka] Response status: {response.status_code}")
-                
-                if response.status_code == 401:
-                    logger.error(f"[e-Sbírka] 401 Unauthorized - Invalid API key")
-                    logger.error(f"[e-Sbírka] Response: {response.text[:500]}")
-                    raise Exception("Invalid API key - check ESBIRKA_API_KEY")
-                
-                if response.status_code == 403:
-                    logger.error(f"[e-Sbírka] 403 Forbidden - Access denied")
-                    raise Exception("Access forbidden - check API permissions")
-                
-                if response.status_code == 429:
-                    retry_after = response.headers.get("Retry-After", "60")
-                    logger.error(f"[e-Sbírka] 429 Rate limited")
-                    raise Exception(f"Rate limited. Retry after {retry_after} seconds")
-                
-                if response.status_code >= 400:
-                    logger.error(f"[e-Sbírka] Error {response.status_code}")
-                    logger.error(f"[e-Sbírka] Response: {response.text[:500]}")
-                    raise Exception(f"API error: {response.status_code}")
-                
-                data = response.json()
-                raw_results = data.get("seznam", [])
-                total_count = data.get("pocetCelkem", 0)
+            response = await self._request("POST", url, json=payload)
+            
+            logger.info(f"[e-Sbírka] Response status: {response.status_code}")
+            
+            if response.status_code == 401:
+                logger.error(f"[e-Sbírka] 401 Unauthorized - Invalid API key")
+                logger.error(f"[e-Sbírka] Response: {response.text[:500]}")
+                raise Exception("Invalid API key - check ESBIRKA_API_KEY")
+            
+            if response.status_code == 403:
+                logger.error(f"[e-Sbírka] 403 Forbidden - Access denied")
+                raise Exception("Access forbidden - check API permissions")
+            
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After", "60")
+                logger.error(f"[e-Sbírka] 429 Rate limited")
+                raise Exception(f"Rate limited. Retry after {retry_after} seconds")
+            
+            if response.status_code >= 400:
+                logger.error(f"[e-Sbírka] Error {response.status_code}")
+                logger.error(f"[e-Sbírka] Response: {response.text[:500]}")
+                raise Exception(f"API error: {response.status_code}")
+            
+            data = orjson.loads(response.content)
+            raw_results = data.get("seznam", [])
+            total_count = data.get("pocetCelkem", 0)
+            
+            logger.info(f"[e-Sbírka] Success - {len(raw_results)} results (total: {total_count})")
+            
+            # Transform to standardized format
+            results = []
+            act_type_lower = legal_act_type.lower() if legal_act_type else None
+            for doc in raw_results:
+                stale_url = doc.get("staleUrl", "")
+                citation = doc.get("kodDokumentuSbirky", "")
+                title = doc.get("nazev", "")
+                status = doc.get("stavDokumentuSbirky", "")
+                date = doc.get("datum", "")
+                title_lower = title.lower()
                 
-                logger.info(f"[e-Sbírka] Success - {len(raw_results)} results (total: {total_count})")
+                # Apply filters if specified
+                if act_type_lower:
+                    if act_type_lower not in title_lower and act_type_lower not in citation.lower():
+                        continue
                 
-                # Transform to standardized format
-                results = []
-                for doc in raw_results:
-                    stale_url = doc.get("staleUrl", "")
-                    citation = doc.get("kodDokumentuSbirky", "")
-                    title = doc.get("nazev", "")
-                    status = doc.get("stavDokumentuSbirky", "")
-                    date = doc.get("datum", "")
-                    
-                    # Apply filters if specified
-                    if legal_act_type:
-                        if legal_act_type.lower() not in title.lower() and legal_act_type.lower() not in citation.lower():
+                if year_from or year_to:
+                    # Extract year from citation (e.g., "262/2006 Sb." -> 2006)
+                    year_match = _YEAR_RE.search(citation)
+                    if year_match:
+                        year = int(year_match.group(1))
+                        if year_from and year < year_from:
+                            continue
+                        if year_to and year > year_to:
                             continue
-                    
-                    if year_from or year_to:
-                        # Extract year from citation (e.g., "262/2006 Sb." -> 2006)
-                        year_match = re.search(r'/(\d{4})', citation)
-                        if year_match:
-                            year = int(year_match.group(1))
-                            if year_from and year < year_from:
-                                continue
-                            if year_to and year > year_to:
-                                continue
-                    
-                    results.append({
-                        "iri": stale_url,
-                        "citation": citation,
-                        "citace": citation,
-                        "title": title,
-                        "nazev": title,
-                        "type": self._detect_law_type(title, citation),
-                        "typ": self._detect_law_type(title, citation),
-                        "status": status,
-                        "effective_from": date,
-                        "verze_od": date,
-                        "staleUrl": stale_url,
-                    })
-                
-                if results:
-                    logger.info(f"[e-Sbírka] First result: {results[0].get('citation')} - {results[0].get('title')[:50]}")
                 
-                return results
+                law_type = self._detect_law_type(title_lower, citation)
+                results.append({
+                    "iri": stale_url,
+                    "citation": citation,
+                    "citace": citation,
+                    "title": title,
+                    "nazev": title,
+                    "type": law_type,
+                    "typ": law_type,
+                    "status": status,
+                    "effective_from": date,
+                    "verze_od": date,
+                    "staleUrl": stale_url,
+                })
+            
+            if results:
+                logger.info(f"[e-Sbírka] First result: {results[0].get('citation')} - {results[0].get('title')[:50]}")
+            
+            return results
 
         except httpx.TimeoutException:
             logger.error(f"[e-Sbírka] Timeout after {self.timeout}s")
@@ -172,20 +311,12 @@ class ESbirkaAPIClient:
             logger.error(f"[e-Sbírka] Request error: {e}")
             raise Exception(f"Request error: {e}")
 
-    def _detect_law_type(self, title: str, citation: str) -> str:
-        """Detect law type from title and citation"""
-        title_lower = title.lower()
-        if "zákon" in title_lower or "zákoník" in title_lower:
-            return "Zákon"
-        elif "nařízení" in title_lower:
-            return "Nařízení"
-        elif "vyhláška" in title_lower:
-            return "Vyhláška"
-        elif "sdělení" in title_lower:
-            return "Sdělení"
-        elif "usnesení" in title_lower:
-            return "Usnesení"
-        elif "Sb. m. s." in citation:
+    def _detect_law_type(self, title_lower: str, citation: str) -> str:
+        """Detect law type from lower-cased title and citation"""
+        for keyword, label in _LAW_TYPES:
+            if keyword in title_lower:
+                return label
+        if "Sb. m. s." in citation:
             return "Mezinárodní smlouva"
         return "Právní předpis"
 
@@ -194,7 +325,21 @@ class ESbirkaAPIClient:
         Retrieve specific legal act details.
         
         Uses GET /dokumenty-sbirky/{staleUrl} endpoint.
+        Responses are cached in memory for ESBIRKA_CACHE_TTL seconds and,
+        if enabled, on disk for ESBIRKA_DISK_CACHE_TTL.
         """
+        cache_key = (stale_url, version_date)
+        cached = self._law_cache.get(cache_key)
+        if cached is not None:
+            # Copy - callers (get_law_full_text) add keys to the returned dict
+            return dict(cached)
+        
+        disk_key = f"esbirka:law:{stale_url}:{version_date or 'current'}"
+        cached = await self._disk_get(disk_key)
+        if cached is not None:
+            self._law_cache.put(cache_key, cached)
+            return dict(cached)
+
         # URL encode the staleUrl (replace / with %2F)
         encoded_url = quote(stale_url, safe='')
         url = f"{self.base_url}/dokumenty-sbirky/{encoded_url}"
@@ -202,80 +347,153 @@ class ESbirkaAPIClient:
         logger.info(f"[e-Sbírka] Get law: {url}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code != 200:
-                    logger.error(f"[e-Sbírka] Get law error: {response.status_code}")
-                    raise Exception(f"Law not found: {stale_url}")
-                
-                data = response.json()
-                
-                return {
-                    "iri": stale_url,
-                    "citation": data.get("kodDokumentuSbirky", ""),
-                    "title": data.get("nazev", ""),
-                    "description": data.get("popis", ""),
-                    "type": data.get("typZneni", ""),
-                    "effective_from": data.get("datumUcinnostiZneniOd", ""),
-                    "effective_to": data.get("datumUcinnostiZneniDo", ""),
-                    "status": data.get("stavDokumentuSbirky", ""),
-                    "full_citation": data.get("uplnaCitace", ""),
-                    "short_citation": data.get("zkracenaCitace", ""),
-                    "amendments": data.get("novely", []),
-                    "raw": data,
-                }
+            response = await self._request("GET", url)
+            
+            if response.status_code != 200:
+                logger.error(f"[e-Sbírka] Get law error: {response.status_code}")
+                raise Exception(f"Law not found: {stale_url}")
+            
+            data = orjson.loads(response.content)
+            
+            law = {
+                "iri": stale_url,
+                "citation": data.get("kodDokumentuSbirky", ""),
+                "title": data.get("nazev", ""),
+                "description": data.get("popis", ""),
+                "type": data.get("typZneni", ""),
+                "effective_from": data.get("datumUcinnostiZneniOd", ""),
+                "effective_to": data.get("datumUcinnostiZneniDo", ""),
+                "status": data.get("stavDokumentuSbirky", ""),
+                "full_citation": data.get("uplnaCitace", ""),
+                "short_citation": data.get("zkracenaCitace", ""),
+                "amendments": data.get("novely", []),
+                "raw": data,
+            }
+            self._law_cache.put(cache_key, law)
+            await self._disk_put(disk_key, law)
+            return dict(law)
 
         except Exception as e:
             logger.error(f"[e-Sbírka] Error fetching law {stale_url}: {e}")
             raise
 
-    async def get_law_fragments(self, stale_url: str, page: int = 1) -> List[Dict]:
-        """
-        Get sections/articles of a legal act.
-        
-        Uses GET /dokumenty-sbirky/{staleUrl}/fragmenty endpoint.
-        """
+    def _fragments_url(self, stale_url: str) -> str:
         encoded_url = quote(stale_url, safe='')
-        url = f"{self.base_url}/dokumenty-sbirky/{encoded_url}/fragmenty"
+        return f"{self.base_url}/dokumenty-sbirky/{encoded_url}/fragmenty"
+
+    async def _get_fragments_page(self, stale_url: str, page: int) -> Optional[Dict]:
+        """Fetch one raw fragments page (memory, then disk cache), or None on error"""
+        cached = self._fragments_cache.get((stale_url, page))
+        if cached is not None:
+            return cached
+        
+        disk_key = f"esbirka:fragments:{stale_url}:{page}"
+        cached = await self._disk_get(disk_key)
+        if cached is not None:
+            self._fragments_cache.put((stale_url, page), cached)
+            return cached
+
+        url = self._fragments_url(stale_url)
         params = {"cisloStranky": page}
 
-        logger.info(f"[e-Sbírka] Get fragments: {url}")
+        logger.info(f"[e-Sbírka] Get fragments: {url} (page {page})")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-                response = await client.get(
-                    url, 
-                    params=params,
-                    headers=self._get_headers()
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"[e-Sbírka] Get fragments error: {response.status_code}")
-                    return []
-                
-                data = response.json()
-                raw_fragments = data.get("seznam", [])
-                total_pages = data.get("pocetStranek", 1)
-                
-                # Transform fragments
-                fragments = []
-                for frag in raw_fragments:
-                    fragments.append({
-                        "id": frag.get("id"),
-                        "full_citation": frag.get("uplnaCitace", ""),
-                        "short_citation": frag.get("zkracenaCitace", ""),
-                        "text": self._strip_html(frag.get("xhtml", "")),
-                        "html": frag.get("xhtml", ""),
-                        "is_effective": frag.get("jeUcinny", True),
-                    })
-                
-                logger.info(f"[e-Sbírka] Got {len(fragments)} fragments (page {page}/{total_pages})")
-                return fragments
+            response = await self._request("GET", url, params=params)
+            
+            if response.status_code != 200:
+                logger.error(f"[e-Sbírka] Get fragments error: {response.status_code}")
+                return None
+            
+            data = orjson.loads(response.content)
+            self._fragments_cache.put((stale_url, page), data)
+            await self._disk_put(disk_key, data)
+            return data
 
         except Exception as e:
             logger.error(f"[e-Sbírka] Error fetching fragments: {e}")
+            return None
+
+    def _transform_fragments(self, raw_fragments: List[Dict]) -> List[Dict]:
+        """Map raw API fragments to the standardized format"""
+        htmls = [frag.get("xhtml", "") for frag in raw_fragments]
+        joined = _FRAGMENT_SEP.join(html or "" for html in htmls)
+        if joined.count(_FRAGMENT_SEP) == len(htmls) - 1:
+            texts = _HTML_TAG_BATCH_RE.sub('', joined).split(_FRAGMENT_SEP)
+        else:
+            # Sentinel occurs in the content itself - strip fragment by fragment
+            texts = [self._strip_html(html) for html in htmls]
+        
+        fragments = []
+        for frag, html, text in zip(raw_fragments, htmls, texts):
+            fragments.append({
+                "id": frag.get("id"),
+                "full_citation": frag.get("uplnaCitace", ""),
+                "short_citation": frag.get("zkracenaCitace", ""),
+                "text": text,
+                "html": html,
+                "is_effective": frag.get("jeUcinny", True),
+            })
+        return fragments
+
+    async def get_law_fragments(self, stale_url: str, page: int = 1) -> List[Dict]:
+        """
+        Get sections/articles of a legal act (single page).
+        
+        Uses GET /dokumenty-sbirky/{staleUrl}/fragmenty endpoint.
+        """
+        data = await self._get_fragments_page(stale_url, page)
+        if data is None:
             return []
+        
+        fragments = self._transform_fragments(data.get("seznam", []))
+        total_pages = data.get("pocetStranek", 1)
+        
+        logger.info(f"[e-Sbírka] Got {len(fragments)} fragments (page {page}/{total_pages})")
+        return fragments
+
+    async def _fetch_all_fragments(self, stale_url: str) -> tuple[List[Dict], List[int]]:
+        """
+        Fragments of every page, plus the page numbers that could not be fetched.
+        
+        Page 1 reports pocetStranek; pages 2..N are then fetched concurrently,
+        at most ESBIRKA_PAGE_CONCURRENCY at a time (large codes have hundreds
+        of pages - an unbounded fan-out trips the API rate limits).
+        """
+        first = await self._get_fragments_page(stale_url, 1)
+        if first is None:
+            return [], [1]
+        
+        raw_fragments = list(first.get("seznam", []))
+        total_pages = first.get("pocetStranek", 1) or 1
+        missing: List[int] = []
+        
+        if total_pages > 1:
+            semaphore = asyncio.Semaphore(settings.ESBIRKA_PAGE_CONCURRENCY)
+            
+            async def fetch_page(page: int) -> Optional[Dict]:
+                async with semaphore:
+                    return await self._get_fragments_page(stale_url, page)
+            
+            pages = await asyncio.gather(*[fetch_page(page) for page in range(2, total_pages + 1)])
+            for page, data in enumerate(pages, start=2):
+                if data is None:
+                    missing.append(page)
+                else:
+                    raw_fragments.extend(data.get("seznam", []))
+        
+        fragments = self._transform_fragments(raw_fragments)
+        logger.info(f"[e-Sbírka] Got {len(fragments)} fragments ({total_pages} pages)")
+        if missing:
+            logger.warning(
+                f"[e-Sbírka] {len(missing)}/{total_pages} fragment pages missing for {stale_url}: {missing}"
+            )
+        return fragments, missing
+
+    async def get_all_law_fragments(self, stale_url: str) -> List[Dict]:
+        """Get all sections/articles of a legal act across every page"""
+        fragments, _ = await self._fetch_all_fragments(stale_url)
+        return fragments
 
     async def get_law_full_text(self, stale_url: str) -> Dict:
         """
@@ -286,25 +504,28 @@ class ESbirkaAPIClient:
         logger.info(f"[e-Sbírka] Getting full text for: {stale_url}")
         
         try:
-            # Get law details
-            law_data = await self.get_law(stale_url)
-            
-            # Get fragments (first page)
-            fragments = await self.get_law_fragments(stale_url, page=1)
+            # Law details and fragments are independent - fetch them concurrently
+            law_data, (fragments, missing_pages) = await asyncio.gather(
+                self.get_law(stale_url),
+                self._fetch_all_fragments(stale_url),
+            )
             
-            # Assemble full text
-            full_text = ""
+            # Assemble full text (joined once - linear in fragment count)
+            parts: List[str] = []
             for frag in fragments:
                 citation = frag.get("full_citation", "")
                 text = frag.get("text", "")
                 if citation:
-                    full_text += f"\n{citation}\n"
+                    parts.append(f"\n{citation}\n")
                 if text:
-                    full_text += f"{text}\n"
+                    parts.append(f"{text}\n")
             
-            law_data["full_text"] = full_text.strip()
+            law_data["full_text"] = "".join(parts).strip()
             law_data["fragments"] = fragments
             law_data["fragment_count"] = len(fragments)
+            # Pages that failed after retries leave holes in full_text - say so
+            law_data["incomplete"] = bool(missing_pages)
+            law_data["missing_pages"] = missing_pages
             
             return law_data
             
@@ -324,15 +545,14 @@ class ESbirkaAPIClient:
         logger.info(f"[e-Sbírka] Get history: {url}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code != 200:
-                    logger.error(f"[e-Sbírka] Get history error: {response.status_code}")
-                    return {"versions": []}
-                
-                data = response.json()
-                return {"versions": data.get("seznam", []), "raw": data}
+            response = await self._request("GET", url)
+            
+            if response.status_code != 200:
+                logger.error(f"[e-Sbírka] Get history error: {response.status_code}")
+                return {"versions": []}
+            
+            data = orjson.loads(response.content)
+            return {"versions": data.get("seznam", []), "raw": data}
 
         except Exception as e:
             logger.error(f"[e-Sbírka] Error fetching history: {e}")
@@ -350,15 +570,14 @@ class ESbirkaAPIClient:
         logger.info(f"[e-Sbírka] Get relationships: {url}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=False) as client:
-                response = await client.get(url, headers=self._get_headers())
-                
-                if response.status_code != 200:
-                    logger.error(f"[e-Sbírka] Get relationships error: {response.status_code}")
-                    return {"relationships": []}
-                
-                data = response.json()
-                return {"relationships": data.get("seznam", []), "raw": data}
+            response = await self._request("GET", url)
+            
+            if response.status_code != 200:
+                logger.error(f"[e-Sbírka] Get relationships error: {response.status_code}")
+                return {"relationships": []}
+            
+            data = orjson.loads(response.content)
+            return {"relationships": data.get("seznam", []), "raw": data}
 
         except Exception as e:
             logger.error(f"[e-Sbírka] Error fetching relationships: {e}")
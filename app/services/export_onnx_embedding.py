@@ -0,0 +1,42 @@
+"""
+Export EMBEDDING_MODEL to ONNX and quantize it to INT8.
+
+Run this script once, then start the API with EMBEDDING_BACKEND=onnx.
+Dynamic INT8 quantization shrinks the MatMul weights 4x and uses
+VNNI instructions on modern CPUs (~3x faster embedding on CPU).
+
+Usage:
+    pip install "optimum[onnxruntime]"
+    python -m app.services.export_onnx_embedding
+"""
+import os
+
+from app.config import settings
+
+
+def export_and_quantize():
+    """Export the model with optimum and write the INT8 file next to it."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+
+    model_name = settings.EMBEDDING_MODEL
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    output_dir = settings.ONNX_MODEL_DIR
+
+    print(f"\n📦 Exporting {model_name} → {output_dir}/")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    source = os.path.join(output_dir, "model.onnx")
+    target = os.path.join(output_dir, settings.ONNX_MODEL_FILE)
+    print(f"⚙️ Quantizing to INT8: {target}")
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+
+    print("\n✅ Done! Set EMBEDDING_BACKEND=onnx to use it.")
+
+
+if __name__ == "__main__":
+    export_and_quantize()
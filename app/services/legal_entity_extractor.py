@@ -9,13 +9,17 @@ Extracts:
 This module is designed to be fail-safe - if extraction fails, it returns
 empty entities and the search continues normally without boosting.
 """
+import logging
 import re
+from functools import cached_property, lru_cache
 from typing import List, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 
 if TYPE_CHECKING:
     from app.models import CaseResult
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # DATA CLASSES
@@ -33,6 +37,11 @@ class ExtractedEntities:
         """Check if any entities were extracted"""
         return bool(self.case_numbers or self.statute_references or self.court_hints)
     
+    @cached_property
+    def statute_re(self) -> "re.Pattern[str]":
+        """All statute references as one lower-case alternation (built once per query)"""
+        return re.compile('|'.join(re.escape(str(statute).lower()) for statute in self.statute_references))
+    
     def __str__(self) -> str:
         parts = []
         if self.case_numbers:
@@ -58,8 +67,10 @@ class LegalEntityExtractor:
     safe defaults to ensure the search pipeline continues.
     """
 
-    # Case number patterns for Czech courts
-    CASE_NUMBER_PATTERNS = [
+    # Case number patterns for Czech courts, fused into one case-insensitive
+    # alternation so the query is scanned once. Each alternative has exactly
+    # one capturing group (the case number itself).
+    CASE_NUMBER_RE = re.compile('|'.join((
         # Supreme Court: "21 Cdo 1234/2020", "29 ICdo 123/2019"
         r'\b(\d{1,2}\s*(?:Cdo|ICdo|Odo|Tdo|Ncu|NSČR)\s*\d+/\d{4})\b',
         # Constitutional Court: "I. ÚS 123/20", "Pl. ÚS 1/2020", "IV.ÚS 123/20"
@@ -70,10 +81,10 @@ class LegalEntityExtractor:
         r'sp\.?\s*zn\.?\s*([A-Za-z0-9\s\.]+/\d{4})',
         # General court case: "5 C 410/2024"
         r'\b(\d{1,2}\s*[A-Z]{1,3}\s*\d+/\d{4})\b',
-    ]
+    )), re.IGNORECASE)
     
-    # Statute reference patterns
-    STATUTE_PATTERNS = [
+    # Statute reference patterns (same layout: one capturing group each)
+    STATUTE_RE = re.compile('|'.join((
         # "§ 2048" or "§2048"
         r'§\s*(\d+)',
         # "§ 123 odst. 1 písm. a)"
@@ -82,19 +93,33 @@ class LegalEntityExtractor:
         r'z\.?\s*č\.?\s*(\d+/\d{4})\s*Sb\.?',
         # "občanského zákoníku", "trestního zákoníku"
         r'(občansk\w+\s+zákoník\w*|trestn\w+\s+zákoník\w*|zákoník\w*\s+práce)',
-    ]
+    )), re.IGNORECASE)
     
-    # Court name patterns and their DataSource mappings
+    # Court name patterns keyed by their DataSource, in priority order
+    # (the first source found becomes the preferred one). Abbreviations are
+    # case-sensitive whole words - otherwise "Ans" or "loans" would read as NS.
     COURT_PATTERNS = {
         # Constitutional Court
-        r'ústavní\w*\s+soud\w*|ÚS\b': 'constitutional_court',
+        'constitutional_court': r'ústavní\w*\s+soud\w*|(?-i:\bÚS\b)',
         # Supreme Court
-        r'nejvyšší\w*\s+soud\w*(?!\s+správní)|NS\b(?!\s*S)': 'supreme_court',
+        'supreme_court': r'nejvyšší\w*\s+soud\w*(?!\s+správní)|(?-i:\bNS\b)(?!\s*S)',
         # Supreme Administrative Court
-        r'nejvyšší\w*\s+správní\w*\s+soud\w*|NSS\b': 'supreme_admin_court',
+        'supreme_admin_court': r'nejvyšší\w*\s+správní\w*\s+soud\w*|(?-i:\bNSS\b)',
         # General/District courts
-        r'okresní\w*\s+soud\w*|krajský\w*\s+soud\w*|obecn\w+\s+soud\w*': 'general_courts',
+        'general_courts': r'okresní\w*\s+soud\w*|krajský\w*\s+soud\w*|obecn\w+\s+soud\w*',
     }
+    # One named group per source - a match reports its source via lastgroup
+    COURT_RE = re.compile(
+        '|'.join(f'(?P<{source}>{pattern})' for source, pattern in COURT_PATTERNS.items()),
+        re.IGNORECASE,
+    )
+    
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
+    # Something every pattern above needs: a digit or "§" (case numbers, §, z. č.),
+    # "zákoník" (named codes), "soud" or a court abbreviation (court hints).
+    # Queries without any of these skip extraction.
+    _TRIGGER_RE = re.compile(r'[\d§]|soud|zákoník|(?-i:\b(?:ÚS|NS|NSS)\b)', re.IGNORECASE)
     
     # Boost multipliers
     CASE_NUMBER_BOOST = 5.0    # Exact case number match
@@ -116,6 +141,10 @@ class LegalEntityExtractor:
         if not query or not isinstance(query, str):
             return entities
         
+        # Most questions mention no case, statute or court - don't run the full patterns
+        if not self._TRIGGER_RE.search(query):
+            return entities
+        
         try:
             # Extract case numbers
             entities.case_numbers = self._extract_case_numbers(query)
@@ -128,48 +157,33 @@ class LegalEntityExtractor:
             
         except Exception as e:
             # Log but don't fail - return whatever we have
-            print(f"⚠️ Entity extraction error (non-fatal): {e}")
+            logger.warning("Entity extraction error (non-fatal): %s", e)
         
         return entities
     
     def _extract_case_numbers(self, query: str) -> List[str]:
         """Extract case numbers from query"""
-        case_numbers = []
-        
         try:
-            for pattern in self.CASE_NUMBER_PATTERNS:
-                try:
-                    matches = re.findall(pattern, query, re.IGNORECASE)
-                    for match in matches:
-                        # Normalize: remove extra spaces
-                        normalized = re.sub(r'\s+', ' ', match.strip())
-                        if normalized and normalized not in case_numbers:
-                            case_numbers.append(normalized)
-                except re.error:
-                    # Skip invalid pattern
-                    continue
+            normalize = self._WHITESPACE_RE.sub
+            # Dict as an ordered set - first-seen order, O(1) dedup
+            case_numbers = {}
+            for match in self.CASE_NUMBER_RE.finditer(query):
+                # Normalize: remove extra spaces
+                case_numbers[normalize(' ', match.group(match.lastindex).strip())] = None
+            case_numbers.pop('', None)
+            return list(case_numbers)
         except Exception:
-            pass
-        
-        return case_numbers
+            return []
     
     def _extract_statutes(self, query: str) -> List[str]:
         """Extract statute references from query"""
-        statutes = []
-        
         try:
-            for pattern in self.STATUTE_PATTERNS:
-                try:
-                    matches = re.findall(pattern, query, re.IGNORECASE)
-                    for match in matches:
-                        if match and match not in statutes:
-                            statutes.append(match)
-                except re.error:
-                    continue
+            # Separate walk: "§ 2" may start a case number ("podle § 2 As 15/2020")
+            statutes = {match.group(match.lastindex): None for match in self.STATUTE_RE.finditer(query)}
+            statutes.pop('', None)
+            return list(statutes)
         except Exception:
-            pass
-        
-        return statutes
+            return []
     
     def _extract_courts(self, query: str) -> tuple[List[str], Optional[str]]:
         """Extract court hints and determine preferred source"""
@@ -177,17 +191,11 @@ class LegalEntityExtractor:
         preferred_source = None
         
         try:
-            query_lower = query.lower()
-            for pattern, source in self.COURT_PATTERNS.items():
-                try:
-                    if re.search(pattern, query_lower):
-                        if source not in court_hints:
-                            court_hints.append(source)
-                        # Set preferred source (first match wins)
-                        if preferred_source is None:
-                            preferred_source = source
-                except re.error:
-                    continue
+            found = {match.lastgroup for match in self.COURT_RE.finditer(query)}
+            # Report in priority order, not order of mention
+            court_hints = [source for source in self.COURT_PATTERNS if source in found]
+            if court_hints:
+                preferred_source = court_hints[0]
         except Exception:
             pass
         
@@ -223,7 +231,7 @@ class LegalEntityExtractor:
             
         except Exception as e:
             # On any error, return no boost
-            print(f"⚠️ Boost calculation error (non-fatal): {e}")
+            logger.warning("Boost calculation error (non-fatal): %s", e)
             return 1.0
         
         return boost
@@ -240,7 +248,7 @@ class LegalEntityExtractor:
             for entity_case in entities.case_numbers:
                 entity_normalized = entity_case.lower().replace(" ", "")
                 if entity_normalized in case_num_normalized or case_num_normalized in entity_normalized:
-                    print(f"   🎯 Exact case match: {case.case_number} → {self.CASE_NUMBER_BOOST}x boost")
+                    logger.debug("Exact case match: %s -> %sx boost", case.case_number, self.CASE_NUMBER_BOOST)
                     return self.CASE_NUMBER_BOOST
         except Exception:
             pass
@@ -257,12 +265,13 @@ class LegalEntityExtractor:
             if not legal_refs:
                 return 1.0
             
-            case_refs = " ".join(str(ref) for ref in legal_refs).lower()
+            case_refs = " ".join(map(str, legal_refs)).lower()
             
-            for statute in entities.statute_references:
-                if str(statute).lower() in case_refs:
-                    print(f"   📜 Statute match: § {statute} in {case.case_number} → {self.STATUTE_BOOST}x boost")
-                    return self.STATUTE_BOOST
+            # One scan of the references for all statutes at once
+            match = entities.statute_re.search(case_refs)
+            if match:
+                logger.debug("Statute match: § %s in %s -> %sx boost", match.group(0), case.case_number, self.STATUTE_BOOST)
+                return self.STATUTE_BOOST
         except Exception:
             pass
         
@@ -301,16 +310,20 @@ def get_extractor() -> LegalEntityExtractor:
     return _extractor
 
 
+@lru_cache(maxsize=1024)
 def extract_entities(query: str) -> ExtractedEntities:
     """
     Safe wrapper to extract entities from query.
     
+    Extraction is a pure function of the query, so results are memoized -
+    repeated questions skip the regex passes. Treat the result as read-only.
+    
     Returns empty ExtractedEntities on any error.
     """
     try:
         return get_extractor().extract(query)
     except Exception as e:
-        print(f"⚠️ Entity extraction failed (non-fatal): {e}")
+        logger.warning("Entity extraction failed (non-fatal): %s", e)
         return ExtractedEntities()
 
 
@@ -323,7 +336,7 @@ def calculate_boost(case: "CaseResult", entities: ExtractedEntities) -> float:
     try:
         return get_extractor().get_boost_score(case, entities)
     except Exception as e:
-        print(f"⚠️ Boost calculation failed (non-fatal): {e}")
+        logger.warning("Boost calculation failed (non-fatal): %s", e)
         return 1.0
 
 
@@ -382,7 +395,7 @@ def build_keyword_filters(entities: ExtractedEntities) -> List[dict]:
                     })
     
     except Exception as e:
-        print(f"⚠️ Filter building failed (non-fatal): {e}")
+        logger.warning("Filter building failed (non-fatal): %s", e)
         return []
     
     return filters
@@ -3,8 +3,13 @@ LLM Service - Optimized for Quality
 Focus: Better queries, better answers
 """
 import asyncio
+import logging
+import re
+from contextlib import aclosing
 from typing import AsyncIterator, Optional, List
 
+import httpx
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
@@ -12,6 +17,9 @@ from langchain_openai import ChatOpenAI
 
 from app.config import settings
 from app.models import CaseResult
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -48,7 +56,10 @@ OTÁZKA: {question}
 DOTAZY:"""
 
 
-ANSWER_PROMPT = """Jsi zkušený český právní analytik. Odpověz na otázku na základě soudních rozhodnutí.
+# Static instructions go in the system message and the (large) case context
+# precedes the question, so repeated calls share a byte-identical prefix
+# that the provider's automatic prompt caching can reuse.
+ANSWER_SYSTEM_PROMPT = """Jsi zkušený český právní analytik. Odpověz na otázku na základě soudních rozhodnutí.
 
 KRITICKÁ PRAVIDLA:
 1. Odpověz PŘÍMO na otázku - první věta musí být jasná odpověď
@@ -65,24 +76,174 @@ STRUKTURA:
 FORMÁT CITACE:
 > „přesná citace z textu rozhodnutí" [1]
 
-To znamená, že... (vysvětlení)
+To znamená, že... (vysvětlení)"""
 
-OTÁZKA: {question}
 
-ROZHODNUTÍ:
+ANSWER_PROMPT = """ROZHODNUTÍ:
 {context}
 
+OTÁZKA: {question}
+
 ODPOVĚĎ:"""
 
 
+CASE_SUMMARY_PROMPT = """Shrň toto soudní rozhodnutí česky ve 3-5 větách: právní otázka, závěr soudu a klíčové odůvodnění. Zachovej čísla paragrafů a zákonů.
+
+ROZHODNUTÍ:
+{text}
+
+SHRNUTÍ:"""
+
+
+# Parsed once at import - every request reuses the same templates
+QUERY_TEMPLATE = ChatPromptTemplate.from_messages([
+    HumanMessagePromptTemplate.from_template(QUERY_PROMPT)
+])
+CASE_SUMMARY_TEMPLATE = ChatPromptTemplate.from_messages([
+    HumanMessagePromptTemplate.from_template(CASE_SUMMARY_PROMPT)
+])
+ANSWER_TEMPLATE = ChatPromptTemplate.from_messages([
+    SystemMessage(content=ANSWER_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template(ANSWER_PROMPT),
+])
+
+
+# Generated query line: optional bullet and/or "N." / "N)" numbering, then the query
+_QUERY_LINE_RE = re.compile(r"\s*(?:[-*•]+\s*)?(?:\d{1,2}[.)]\s*)?(.*?)\s*$")
+
+# Separator between cases in the answer context
+_CASE_RULE = "═" * 80
+
+
 # =============================================================================
 # LLM SERVICE
 # =============================================================================
 
+# Reasoning models served through OpenRouter may inline their thinking
+_THINK_TAG_RE = re.compile(r"<(/?)(?:think|thinking|reasoning)>")
+_MAX_TAG_LEN = len("</reasoning>")
+
+
+class _ThinkingFilter:
+    """
+    Streaming filter that drops <think>...</think> (and the thinking/reasoning
+    variants) from model output, including the text between the tags.
+    
+    A possible partial tag at the end of a chunk is held back until the
+    next chunk, so tags split across chunk boundaries are still caught.
+    """
+    __slots__ = ("_pending", "_inside")
+    
+    def __init__(self):
+        self._pending = ""
+        self._inside = False
+    
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk
+        out = []
+        pos = 0
+        for match in _THINK_TAG_RE.finditer(text):
+            if not self._inside:
+                out.append(text[pos:match.start()])
+            self._inside = not match.group(1)
+            pos = match.end()
+        
+        rest = text[pos:]
+        cut = rest.rfind("<", max(0, len(rest) - _MAX_TAG_LEN + 1))
+        if cut != -1 and ">" not in rest[cut:]:
+            self._pending = rest[cut:]
+            rest = rest[:cut]
+        else:
+            self._pending = ""
+        
+        if not self._inside:
+            out.append(rest)
+        return "".join(out)
+    
+    def flush(self) -> str:
+        text, self._pending = self._pending, ""
+        return "" if self._inside else text
+
+
+def _strip_thinking(text: str) -> str:
+    thinking = _ThinkingFilter()
+    return thinking.feed(text) + thinking.flush()
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def _answer_cache_key(question: str, cases: List[CaseResult]) -> tuple:
+    # Case order matters - the answer cites cases by their [index]
+    return (_normalize_question(question), tuple(case.case_number for case in cases))
+
+
 class LLMService:
     def __init__(self):
         self._main_model: Optional[ChatOpenAI] = None
         self._fast_model: Optional[ChatOpenAI] = None
+        self._light_answer_model: Optional[ChatOpenAI] = None
+        self._summary_model: Optional[ChatOpenAI] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._query_chain = None
+        self._answer_chain = None
+        self._light_answer_chain = None
+        self._summary_chain = None
+        # Repeated questions skip the LLM round trip entirely
+        self._query_cache = TTLCache(settings.LLM_CACHE_MAX_SIZE, settings.LLM_CACHE_TTL)
+        self._answer_cache = TTLCache(settings.LLM_CACHE_MAX_SIZE, settings.LLM_CACHE_TTL)
+        # ecli or (court, case_number) -> summary; case numbers alone repeat across
+        # district courts. Decisions don't change, only the TTL bounds staleness.
+        self._summary_cache = TTLCache(settings.LLM_CACHE_MAX_SIZE, settings.LLM_CACHE_TTL)
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        One HTTP/2 keep-alive client for every OpenRouter call (both chat
+        models and Sonar) - one TLS handshake per process, not per model.
+        Per-call timeouts still come from each model / request.
+        """
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT),
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+        return self._http
+    
+    async def warmup(self) -> None:
+        """
+        Build the models and chains and open the OpenRouter connection
+        (TCP + TLS) before the first real request arrives.
+        """
+        if not settings.OPENROUTER_API_KEY:
+            return
+        try:
+            _ = self.query_chain, self.answer_chain
+            # Any response will do - the point is the pooled connection
+            await self._get_http_client().get(
+                f"{settings.OPENROUTER_BASE_URL}/auth/key",
+                headers=self._sonar_headers(),
+                timeout=10.0,
+            )
+            logger.info("LLM warmup: OpenRouter connection ready")
+        except Exception as e:
+            logger.warning("LLM warmup failed (non-fatal): %s", e)
+    
+    async def aclose(self) -> None:
+        """Close the shared client (called on application shutdown)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        # Models hold the closed client - rebuild them on next use
+        self._main_model = None
+        self._fast_model = None
+        self._light_answer_model = None
+        self._summary_model = None
+        self._query_chain = None
+        self._answer_chain = None
+        self._light_answer_chain = None
+        self._summary_chain = None
     
     @property
     def main_model(self) -> ChatOpenAI:
@@ -94,6 +255,7 @@ class LLMService:
                 temperature=0.1,  # Lower for more focused answers
                 max_tokens=settings.LLM_MAX_TOKENS,
                 timeout=settings.LLM_TIMEOUT,
+                http_async_client=self._get_http_client(),
             )
         return self._main_model
     
@@ -107,45 +269,173 @@ class LLMService:
                 temperature=0.5,  # More creative for query generation
                 max_tokens=2000,
                 timeout=60.0,
+                http_async_client=self._get_http_client(),
             )
         return self._fast_model
     
+    @property
+    def light_answer_model(self) -> ChatOpenAI:
+        """FAST_MODEL with the answer settings (not the query-generation ones)"""
+        if self._light_answer_model is None:
+            self._light_answer_model = ChatOpenAI(
+                model=settings.FAST_MODEL,
+                api_key=settings.OPENROUTER_API_KEY,
+                base_url=settings.OPENROUTER_BASE_URL,
+                temperature=0.1,
+                max_tokens=settings.LLM_MAX_TOKENS,
+                timeout=settings.LLM_TIMEOUT,
+                http_async_client=self._get_http_client(),
+            )
+        return self._light_answer_model
+    
+    @property
+    def summary_model(self) -> ChatOpenAI:
+        """FAST_MODEL for case summaries - focused and capped at CASE_SUMMARY_MAX_TOKENS"""
+        if self._summary_model is None:
+            self._summary_model = ChatOpenAI(
+                model=settings.FAST_MODEL,
+                api_key=settings.OPENROUTER_API_KEY,
+                base_url=settings.OPENROUTER_BASE_URL,
+                temperature=0.1,
+                max_tokens=settings.CASE_SUMMARY_MAX_TOKENS,
+                timeout=60.0,
+                http_async_client=self._get_http_client(),
+            )
+        return self._summary_model
+    
+    @property
+    def query_chain(self):
+        if self._query_chain is None:
+            self._query_chain = QUERY_TEMPLATE | self.fast_model | StrOutputParser()
+        return self._query_chain
+    
+    @property
+    def answer_chain(self):
+        if self._answer_chain is None:
+            self._answer_chain = ANSWER_TEMPLATE | self.main_model | StrOutputParser()
+        return self._answer_chain
+    
+    @property
+    def light_answer_chain(self):
+        if self._light_answer_chain is None:
+            self._light_answer_chain = ANSWER_TEMPLATE | self.light_answer_model | StrOutputParser()
+        return self._light_answer_chain
+    
+    @property
+    def summary_chain(self):
+        if self._summary_chain is None:
+            self._summary_chain = CASE_SUMMARY_TEMPLATE | self.summary_model | StrOutputParser()
+        return self._summary_chain
+    
+    async def _summarize_case(self, case: CaseResult) -> CaseResult:
+        """Case with its text replaced by a FAST_MODEL summary (unchanged on failure)"""
+        text = case.subject or ""
+        if not text:
+            return case
+        
+        cache_key = case.ecli or (case.court, case.case_number)
+        summary = self._summary_cache.get(cache_key)
+        if summary is None:
+            try:
+                summary = _strip_thinking(
+                    await self.summary_chain.ainvoke({"text": text[:15000]})
+                ).strip()
+            except Exception as e:
+                logger.warning("Case summary failed for %s (non-fatal): %s", case.case_number, e)
+                return case
+            if not summary:
+                return case
+            self._summary_cache.put(cache_key, summary)
+        
+        # Marked, so the answer model doesn't quote it as the decision's own words
+        return case.model_copy(update={"subject": f"[Shrnutí rozhodnutí, ne doslovný text]\n{summary}"})
+    
+    async def _condense_cases(self, cases: List[CaseResult]) -> List[CaseResult]:
+        """
+        With ENABLE_CASE_SUMMARIES, keep the top CASE_SUMMARY_KEEP_FULL cases
+        in full and replace the rest by short summaries (generated in
+        parallel, cached per case) - a much smaller answer prompt.
+        """
+        keep = settings.CASE_SUMMARY_KEEP_FULL
+        if not settings.ENABLE_CASE_SUMMARIES or len(cases) <= keep:
+            return cases
+        
+        summarized = await asyncio.gather(*(self._summarize_case(case) for case in cases[keep:]))
+        return cases[:keep] + list(summarized)
+    
+    def _select_answer_chain(self, question: str, cases: List[CaseResult]):
+        """
+        Pick the answer model. With ENABLE_ANSWER_ROUTING, a short question
+        over a handful of cases goes to FAST_MODEL; everything else (and
+        the default) uses LLM_MODEL.
+        """
+        if (
+            settings.ENABLE_ANSWER_ROUTING
+            and len(cases) <= settings.ANSWER_ROUTING_MAX_CASES
+            and len(question.split()) < settings.ANSWER_ROUTING_MAX_WORDS
+        ):
+            logger.debug("Routing answer to %s", settings.FAST_MODEL)
+            return self.light_answer_chain
+        return self.answer_chain
+    
+    @staticmethod
+    def _parse_query_line(line: str) -> Optional[str]:
+        """One generated line -> search query (None for blanks and noise)"""
+        # Strip bullets / numbering and surrounding whitespace in one match
+        query = _QUERY_LINE_RE.match(line).group(1)
+        # Skip empty lines and fragments too short to search for
+        return query if len(query) >= 5 else None
+    
     async def generate_search_queries(self, question: str, num_queries: int = 7) -> List[str]:
-        """Generate multiple search queries for better recall"""
+        """
+        Generate multiple search queries for better recall.
+        
+        The answer is streamed and parsed line by line; generation is cut off
+        as soon as enough queries are in, instead of waiting for the model to
+        finish whatever else it writes.
+        """
+        cache_key = (_normalize_question(question), num_queries)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            # Same variants, but lead with the question exactly as asked
+            return [question] + cached[1:]
+        
         try:
-            prompt = ChatPromptTemplate.from_messages([
-                HumanMessagePromptTemplate.from_template(QUERY_PROMPT)
-            ])
-            chain = prompt | self.fast_model | StrOutputParser()
-            
-            result = await chain.ainvoke({"question": question})
-            
-            # Parse queries - be more lenient
-            queries = []
-            for line in result.split("\n"):
-                line = line.strip()
-                # Skip empty lines and lines that look like instructions
-                if not line or len(line) < 5:
-                    continue
-                if line.startswith(("-", "*", "•", "1.", "2.", "3.")):
-                    line = line.lstrip("-*•0123456789. ")
-                if len(line) >= 5:
-                    queries.append(line)
-            
             # Always include original question first
             final = [question]
-            for q in queries:
-                if q.lower() != question.lower() and q not in final:
+            seen = {question}
+            question_lower = question.lower()
+            
+            def add(line: str) -> None:
+                q = self._parse_query_line(line)
+                if q and q not in seen and q.lower() != question_lower:
+                    seen.add(q)
                     final.append(q)
             
-            print(f"✅ Generated {len(final)} queries:")
-            for q in final[:5]:
-                print(f"   • {q[:60]}...")
+            pending = ""
+            # aclosing: breaking out early closes the stream (and the HTTP response)
+            async with aclosing(self.query_chain.astream({"question": question})) as stream:
+                async for chunk in stream:
+                    pending += chunk
+                    *lines, pending = pending.split("\n")
+                    for line in lines:
+                        add(line)
+                    if len(final) >= num_queries:
+                        break
+                else:
+                    add(pending)
+            
+            logger.info("Generated %d queries", len(final))
+            if logger.isEnabledFor(logging.DEBUG):
+                for q in final[:5]:
+                    logger.debug("  • %.60s", q)
             
-            return final[:num_queries]
+            final = final[:num_queries]
+            self._query_cache.put(cache_key, final)
+            return list(final)
             
         except Exception as e:
-            print(f"⚠️ Query generation failed: {e}")
+            logger.warning("Query generation failed: %s", e)
             return [question]
     
     def _format_cases_for_context(self, cases: List[CaseResult]) -> str:
@@ -162,42 +452,37 @@ class LLMService:
             if not text:
                 text = "[Text rozhodnutí není k dispozici]"
             
-            # Truncate if needed with clear marker
-            truncated = False
-            if len(text) > max_per_case:
-                text = text[:max_per_case]
-                truncated = True
+            # Truncate once to whichever limit is tighter, with clear marker
+            remaining = max_total_chars - total_chars
+            if len(text) > remaining and remaining <= 1000:
+                # Add note that more cases were skipped
+                parts.append(f"\n[Dalších {len(cases) - i + 1} rozhodnutí vynecháno kvůli limitu kontextu]")
+                break
             
-            # Check total context size
-            if total_chars + len(text) > max_total_chars:
-                remaining = max_total_chars - total_chars
-                if remaining > 1000:
-                    text = text[:remaining]
-                    truncated = True
-                else:
-                    # Add note that more cases were skipped
-                    parts.append(f"\n[Dalších {len(cases) - i + 1} rozhodnutí vynecháno kvůli limitu kontextu]")
-                    break
+            limit = min(max_per_case, remaining)
+            truncated = len(text) > limit
+            if truncated:
+                text = text[:limit]
             
             truncation_note = ""
             if truncated:
                 truncation_note = f"\n[⚠️ Text zkrácen z {original_length:,} na {len(text):,} znaků]"
             
             parts.append(f"""
-{'═'*80}
+{_CASE_RULE}
 [{i}] {case.case_number}
 Soud: {case.court}
 Datum: {case.date_issued or "N/A"}
 Relevance skóre: {case.relevance_score:.3f}
 Délka textu: {len(text):,} znaků{truncation_note}
-{'═'*80}
+{_CASE_RULE}
 
 {text}
 """)
             total_chars += len(text)
         
         result = "\n".join(parts)
-        print(f"   📄 Context: {len(result):,} chars, {len(cases)} cases")
+        logger.debug("Context: %d chars, %d cases", len(result), len(cases))
         return result
     
     async def answer_based_on_cases(self, question: str, cases: List[CaseResult]) -> str:
@@ -205,26 +490,28 @@ Délka textu: {len(text):,} znaků{truncation_note}
         if not cases:
             return "Nemám odpověď na tuto otázku. V databázi jsem nenašel žádná soudní rozhodnutí."
         
+        cache_key = _answer_cache_key(question, cases)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            context = self._format_cases_for_context(cases)
-            
-            print(f"📤 Sending {len(cases)} cases to LLM")
-            print(f"   Context: {len(context):,} chars")
+            context = self._format_cases_for_context(await self._condense_cases(cases))
             
-            prompt = ChatPromptTemplate.from_messages([
-                HumanMessagePromptTemplate.from_template(ANSWER_PROMPT)
-            ])
-            chain = prompt | self.main_model | StrOutputParser()
+            logger.info("Sending %d cases to LLM (%d chars)", len(cases), len(context))
             
-            answer = await chain.ainvoke({
+            chain = self._select_answer_chain(question, cases)
+            answer = _strip_thinking(await chain.ainvoke({
                 "question": question,
                 "context": context
-            })
+            }))
             
+            if answer:
+                self._answer_cache.put(cache_key, answer)
             return answer
             
         except Exception as e:
-            print(f"⚠️ Answer generation failed: {e}")
+            logger.warning("Answer generation failed: %s", e)
             return "Došlo k chybě při generování odpovědi."
     
     async def answer_based_on_cases_stream(
@@ -235,26 +522,40 @@ Délka textu: {len(text):,} znaků{truncation_note}
             yield "Nemám odpověď na tuto otázku. V databázi jsem nenašel žádná soudní rozhodnutí."
             return
         
+        cache_key = _answer_cache_key(question, cases)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
         try:
-            context = self._format_cases_for_context(cases)
+            context = self._format_cases_for_context(await self._condense_cases(cases))
             
-            print(f"📤 Streaming {len(cases)} cases")
-            print(f"   Context: {len(context):,} chars")
-            
-            prompt = ChatPromptTemplate.from_messages([
-                HumanMessagePromptTemplate.from_template(ANSWER_PROMPT)
-            ])
-            chain = prompt | self.main_model | StrOutputParser()
+            logger.info("Streaming answer for %d cases (%d chars)", len(cases), len(context))
             
+            parts = []
+            thinking = _ThinkingFilter()
+            chain = self._select_answer_chain(question, cases)
             async for chunk in chain.astream({
                 "question": question,
                 "context": context
             }):
+                chunk = thinking.feed(chunk)
                 if chunk:
+                    parts.append(chunk)
                     yield chunk
+            
+            tail = thinking.flush()
+            if tail:
+                parts.append(tail)
+                yield tail
+            
+            # Only complete answers are cached (a disconnect never gets here)
+            if parts:
+                self._answer_cache.put(cache_key, "".join(parts))
                     
         except Exception as e:
-            print(f"⚠️ Streaming failed: {e}")
+            logger.warning("Streaming failed: %s", e)
             yield "Došlo k chybě při generování odpovědi."
     
     # Skip relevance filtering - cross-encoder handles this now
@@ -269,102 +570,109 @@ Délka textu: {len(text):,} znaků{truncation_note}
         return cases
     
     # Sonar for web search
+    def _sonar_request(self, question: str, stream: bool = False) -> dict:
+        """Chat completion body for Perplexity Sonar via OpenRouter"""
+        return {
+            "model": "perplexity/sonar",
+            "messages": [
+                {"role": "system", "content": "Jsi právní expert na české právo. Odpovídej česky. Vždy uveď zdroje."},
+                {"role": "user", "content": question}
+            ],
+            "temperature": 0.7,
+            "stream": stream,
+        }
+    
+    def _sonar_headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+        }
+    
     async def get_sonar_answer(self, question: str) -> tuple[str, list[str]]:
         """
         Get Perplexity Sonar answer with citations.
         Uses direct HTTP to access top-level citations field.
         """
-        import httpx
-        
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{settings.OPENROUTER_BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "perplexity/sonar",
-                        "messages": [
-                            {"role": "system", "content": "Jsi právní expert na české právo. Odpovídej česky. Vždy uveď zdroje."},
-                            {"role": "user", "content": question}
-                        ],
-                        "temperature": 0.7,
-                    }
-                )
-                
-                data = response.json()
-                
-                # Extract content
-                content = ""
-                if "choices" in data and len(data["choices"]) > 0:
-                    content = data["choices"][0].get("message", {}).get("content", "")
-                
-                # Extract citations from top level
-                citations = data.get("citations", [])
-                
-                print(f"📚 Sonar: {len(content)} chars, {len(citations)} citations")
-                
-                return content, citations
+            response = await self._get_http_client().post(
+                f"{settings.OPENROUTER_BASE_URL}/chat/completions",
+                headers=self._sonar_headers(),
+                json=self._sonar_request(question),
+                timeout=120.0,
+            )
+            
+            data = response.json()
+            
+            # Extract content
+            content = ""
+            if "choices" in data and len(data["choices"]) > 0:
+                content = data["choices"][0].get("message", {}).get("content", "")
+            
+            # Extract citations from top level
+            citations = data.get("citations", [])
+            
+            logger.info("Sonar: %d chars, %d citations", len(content), len(citations))
+            
+            return content, citations
                 
         except Exception as e:
-            print(f"⚠️ Sonar error: {e}")
+            logger.warning("Sonar error: %s", e)
             return "", []
     
     async def get_sonar_answer_stream(self, question: str):
         """
         Stream Perplexity Sonar response and extract citations.
-        Citations are returned at the top level of the OpenRouter response.
-        """
-        import httpx
         
+        Yields (chunk, None, None) for each content delta as it arrives, then
+        (None, full_answer, citations) once. Citations ride along on the
+        top level of the streamed events (LangChain doesn't expose that
+        field), so one streamed request returns both - no second call.
+        """
         try:
-            # Use direct HTTP call to get citations from top-level response
-            # LangChain doesn't expose the top-level 'citations' field
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{settings.OPENROUTER_BASE_URL}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "perplexity/sonar",
-                        "messages": [
-                            {"role": "system", "content": "Jsi právní expert na české právo. Odpovídej česky. Vždy uveď zdroje."},
-                            {"role": "user", "content": question}
-                        ],
-                        "temperature": 0.7,
-                    }
-                )
-                
-                data = response.json()
-                
-                # Extract content
-                full_answer = ""
-                if "choices" in data and len(data["choices"]) > 0:
-                    full_answer = data["choices"][0].get("message", {}).get("content", "")
-                
-                # Extract citations from top level
-                citations = data.get("citations", [])
-                
-                print(f"📚 Sonar response: {len(full_answer)} chars, {len(citations)} citations")
-                if citations:
-                    for i, url in enumerate(citations[:5]):
-                        print(f"   [{i+1}] {url[:60]}...")
-                
-                # Yield the full answer (non-streaming for now to get citations)
-                if full_answer:
-                    yield full_answer, None, None
+            parts: List[str] = []
+            citations: list = []
+            
+            async with self._get_http_client().stream(
+                "POST",
+                f"{settings.OPENROUTER_BASE_URL}/chat/completions",
+                headers=self._sonar_headers(),
+                json=self._sonar_request(question, stream=True),
+                timeout=120.0,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
                 
-                yield None, full_answer, citations
+                async for line in response.aiter_lines():
+                    # SSE: skip keep-alive comments and blank separators
+                    if not line.startswith("data: "):
+                        continue
+                    payload = line[6:]
+                    if payload == "[DONE]":
+                        break
+                    
+                    data = orjson.loads(payload)
+                    if data.get("citations"):
+                        citations = data["citations"]
+                    
+                    choices = data.get("choices") or []
+                    if choices:
+                        chunk = (choices[0].get("delta") or {}).get("content")
+                        if chunk:
+                            parts.append(chunk)
+                            yield chunk, None, None
+            
+            full_answer = "".join(parts)
+            
+            logger.info("Sonar response: %d chars, %d citations", len(full_answer), len(citations))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, url in enumerate(citations[:5], 1):
+                    logger.debug("  [%d] %.60s", i, url)
+            
+            yield None, full_answer, citations
                 
         except Exception as e:
-            print(f"⚠️ Sonar error: {e}")
-            import traceback
-            traceback.print_exc()
-            yield None, "", []
+            logger.exception("Sonar error: %s", e)
             yield None, "", []
     
     async def generate_summary_stream(
@@ -384,7 +692,7 @@ SHRNUTÍ:"""
                     yield chunk.content
                     
         except Exception as e:
-            print(f"⚠️ Summary error: {e}")
+            logger.warning("Summary error: %s", e)
 
 
 # Global instance
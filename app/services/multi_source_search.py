@@ -11,14 +11,27 @@ Pipeline:
 6. Return top results with full text
 """
 import asyncio
+import hashlib
+import heapq
+import logging
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from dataclasses import dataclass
-import httpx
+from dataclasses import dataclass, field
+import numpy as np
+import orjson
 from sentence_transformers import SentenceTransformer, CrossEncoder
 
 from app.config import settings
 from app.models import CaseResult
+from app.services.embedding import (
+    aembed_with_cache,
+    embed_with_cache,
+    get_device,
+    get_embedding_model,
+    get_model_kwargs,
+)
+from app.services.qdrant import qdrant_post
+from app.services.query_cache import get_query_cache
 from app.services.legal_entity_extractor import (
     extract_entities,
     calculate_boost,
@@ -26,6 +39,9 @@ from app.services.legal_entity_extractor import (
     has_searchable_entities,
     ExtractedEntities,
 )
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 class DataSource(str, Enum):
@@ -36,6 +52,14 @@ class DataSource(str, Enum):
     GENERAL_COURTS = "general_courts"
 
 
+# What ALL_COURTS expands to, in search order (built once, not per request)
+_ALL_COURTS = (
+    DataSource.CONSTITUTIONAL_COURT,
+    DataSource.SUPREME_COURT,
+    DataSource.SUPREME_ADMIN_COURT,
+)
+
+
 @dataclass
 class CollectionConfig:
     name: str
@@ -43,6 +67,14 @@ class CollectionConfig:
     vector_size: int
     display_name: str
     uses_chunking: bool = False
+    cache_threshold: float = settings.QUERY_CACHE_THRESHOLD
+    # Qdrant endpoint paths, resolved once instead of formatted per request
+    search_path: str = field(init=False)
+    batch_search_path: str = field(init=False)
+    
+    def __post_init__(self):
+        self.search_path = f"/collections/{self.name}/points/search"
+        self.batch_search_path = f"/collections/{self.name}/points/search/batch"
 
 
 def get_collection_configs() -> Dict[DataSource, CollectionConfig]:
@@ -93,30 +125,51 @@ def get_configs() -> Dict[DataSource, CollectionConfig]:
 # =============================================================================
 
 class EmbeddingManager:
-    """Embedding model manager"""
+    """
+    Embedding model manager
+    
+    EMBEDDING_MODEL is owned by app.services.embedding (one shared instance,
+    HuggingFace or ONNX backend); other models are loaded here on first use.
+    """
     
     def __init__(self):
         self._models: Dict[str, SentenceTransformer] = {}
     
-    def get_embedding(self, text: str, model_name: str) -> List[float]:
+    def _get_model(self, model_name: str) -> SentenceTransformer:
         if model_name not in self._models:
-            print(f"🧠 Loading embedding: {model_name}")
-            self._models[model_name] = SentenceTransformer(model_name, device="cpu")
-        
-        model = self._models[model_name]
-        normalize = "retromae" in model_name.lower()
-        return model.encode(text, normalize_embeddings=normalize).tolist()
+            logger.info("Loading embedding model: %s", model_name)
+            self._models[model_name] = SentenceTransformer(
+                model_name, device=get_device(), model_kwargs=get_model_kwargs()
+            )
+        return self._models[model_name]
+    
+    def _encode(self, texts: List[str], model_name: str) -> List[List[float]]:
+        if model_name == settings.EMBEDDING_MODEL:
+            return get_embedding_model().embed_documents(texts)
+        
+        model = self._get_model(model_name)
+        embeddings = model.encode(
+            texts, normalize_embeddings=True, convert_to_numpy=True, batch_size=32
+        )
+        # One conversion of the float32 matrix at the JSON boundary
+        return embeddings.tolist()
+    
+    def get_embedding(self, text: str, model_name: str) -> List[float]:
+        return self.get_embeddings_batch([text], model_name)[0]
     
     def get_embeddings_batch(self, texts: List[str], model_name: str) -> List[List[float]]:
-        """Batch embedding for efficiency"""
-        if model_name not in self._models:
-            print(f"🧠 Loading embedding: {model_name}")
-            self._models[model_name] = SentenceTransformer(model_name, device="cpu")
-        
-        model = self._models[model_name]
-        normalize = "retromae" in model_name.lower()
-        embeddings = model.encode(texts, normalize_embeddings=normalize, batch_size=32)
-        return [e.tolist() for e in embeddings]
+        """Batch embedding - repeated queries are served from the embedding cache"""
+        return embed_with_cache(texts, model_name, lambda misses: self._encode(misses, model_name))
+    
+    async def aget_embedding(self, text: str, model_name: str) -> List[float]:
+        return (await self.aget_embeddings_batch([text], model_name))[0]
+    
+    async def aget_embeddings_batch(self, texts: List[str], model_name: str) -> List[List[float]]:
+        """
+        Batch embedding without blocking the event loop - all cache misses
+        are encoded together in one model call on a worker thread.
+        """
+        return await aembed_with_cache(texts, model_name, lambda misses: self._encode(misses, model_name))
 
 
 class CrossEncoderManager:
@@ -132,8 +185,8 @@ class CrossEncoderManager:
     
     def _get_model(self) -> CrossEncoder:
         if self._model is None:
-            print(f"🎯 Loading multilingual cross-encoder: {self._model_name}")
-            self._model = CrossEncoder(self._model_name, device="cpu", max_length=512)
+            logger.info("Loading multilingual cross-encoder: %s", self._model_name)
+            self._model = CrossEncoder(self._model_name, device=get_device(), max_length=512)
         return self._model
     
     def rerank(self, query: str, cases: List[CaseResult], top_k: int = 10) -> List[CaseResult]:
@@ -153,7 +206,7 @@ class CrossEncoderManager:
             pairs.append([query, text])
         
         # Score all pairs
-        print(f"   Scoring {len(pairs)} query-document pairs...")
+        logger.debug("Scoring %d query-document pairs", len(pairs))
         scores = model.predict(pairs, show_progress_bar=False)
         
         # Sort by cross-encoder score
@@ -161,7 +214,8 @@ class CrossEncoderManager:
         scored_cases.sort(key=lambda x: x[1], reverse=True)
         
         # Log top scores for debugging
-        print(f"   Top 3 scores: {[f'{s:.3f}' for _, s in scored_cases[:3]]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Top 3 scores: %s", [f"{s:.3f}" for _, s in scored_cases[:3]])
         
         # Update relevance scores and return top_k
         result = []
@@ -176,6 +230,38 @@ embedding_manager = EmbeddingManager()
 cross_encoder_manager = CrossEncoderManager()
 
 
+def _dedupe_queries(queries: List[str]) -> List[str]:
+    """Drop queries that only differ in case/whitespace, keeping first-seen order"""
+    unique: Dict[str, str] = {}
+    for query in queries:
+        unique.setdefault(" ".join(query.lower().split()), query)
+    return list(unique.values())
+
+
+def _log_top(cases: List[CaseResult]) -> None:
+    """Per-result summary of a finished search (DEBUG only)"""
+    for i, case in enumerate(cases, 1):
+        logger.debug(
+            "[%d] %s (%s) - %s chars, score: %.3f",
+            i, case.case_number, case.court, f"{len(case.subject or ''):,}", case.relevance_score,
+        )
+
+
+def _best_per_case(hits: List[CaseResult]) -> Dict[str, CaseResult]:
+    """Keep the best-scoring hit per case number (one dict lookup per hit, ties keep the earlier)"""
+    best: Dict[str, CaseResult] = {}
+    for case in hits:
+        current = best.get(case.case_number)
+        if current is None or case.relevance_score > current.relevance_score:
+            best[case.case_number] = case
+    return best
+
+
+def _dedupe_best(cases: List[CaseResult]) -> List[CaseResult]:
+    """Keep the best-scoring chunk per case number"""
+    return list(_best_per_case(cases).values())
+
+
 # =============================================================================
 # MAIN SEARCH ENGINE
 # =============================================================================
@@ -192,9 +278,10 @@ class MultiSourceSearchEngine:
     """
     
     def __init__(self):
-        self.qdrant_url = settings.qdrant_url
-        self.headers = {"api-key": settings.QDRANT_API_KEY} if settings.QDRANT_API_KEY else {}
+        # Requests go over the shared pooled client (app.services.qdrant)
         self.timeout = settings.QDRANT_INITIAL_TIMEOUT
+        # (collection, limit, vector hash) -> parsed cases
+        self._search_cache = TTLCache(settings.SEARCH_CACHE_MAX_SIZE, settings.SEARCH_CACHE_TTL)
     
     async def search(
         self,
@@ -211,13 +298,13 @@ class MultiSourceSearchEngine:
         5. Fetch full_text from chunk 0 for final results
         6. Return top results with complete text
         """
-        print(f"\n🔍 Quality Search: {len(queries)} queries")
+        logger.debug("Quality search: %d queries", len(queries))
         
         # Step 1: Extract legal entities from original query (fail-safe)
         original_query = queries[0] if queries else ""
         entities = extract_entities(original_query)
         if entities.has_entities():
-            print(f"📋 {entities}")
+            logger.debug("%s", entities)
         
         # Determine courts - use entity hint if available and source is ALL_COURTS
         if source == DataSource.ALL_COURTS:
@@ -225,106 +312,177 @@ class MultiSourceSearchEngine:
                 # User mentioned a specific court, prioritize it but still search others
                 preferred = DataSource(entities.preferred_source)
                 courts = [preferred]  # Search preferred court first
-                other_courts = [
-                    DataSource.CONSTITUTIONAL_COURT,
-                    DataSource.SUPREME_COURT,
-                    DataSource.SUPREME_ADMIN_COURT,
-                ]
-                courts.extend([c for c in other_courts if c != preferred])
-                print(f"   🏛️ Prioritizing {preferred.value} based on query")
+                courts.extend([c for c in _ALL_COURTS if c != preferred])
+                logger.debug("Prioritizing %s based on query", preferred.value)
             else:
-                courts = [
-                    DataSource.CONSTITUTIONAL_COURT,
-                    DataSource.SUPREME_COURT,
-                    DataSource.SUPREME_ADMIN_COURT,
-                ]
+                courts = list(_ALL_COURTS)
         else:
             courts = [source]
         
-        # Generate embeddings for all queries at once
-        config = get_configs()[courts[0]]
-        print(f"🧠 Generating {len(queries)} embeddings...")
-        vectors = embedding_manager.get_embeddings_batch(queries, config.embedding_model)
-        
         # === HYBRID SEARCH: Keyword + Vector ===
-        all_cases: Dict[str, CaseResult] = {}
+        # Hits are collected keyword-first; on equal scores the earlier hit wins
+        hits: List[CaseResult] = []
         
-        # Step 2a: Keyword search for exact matches (if entities found)
+        # Step 2a: Keyword search for exact matches (if entities found).
+        # It doesn't need embeddings - start it now so it runs under the encode.
+        keyword_future = None
         if has_searchable_entities(entities):
-            print(f"🔑 Running keyword search for extracted entities...")
+            logger.debug("Running keyword search for extracted entities")
             keyword_tasks = [self._keyword_search_court(court, entities) for court in courts]
-            keyword_results = await asyncio.gather(*keyword_tasks, return_exceptions=True)
-            
-            keyword_count = 0
-            for result in keyword_results:
+            keyword_future = asyncio.gather(*keyword_tasks, return_exceptions=True)
+        
+        # Generated variants often repeat up to case/whitespace - search each once
+        unique_queries = _dedupe_queries(queries)
+        
+        # Generate embeddings for all queries at once
+        config = get_configs()[courts[0]]
+        logger.debug("Generating %d embeddings", len(unique_queries))
+        # One float32 matrix - rows are serialized straight into the Qdrant requests
+        vectors = np.asarray(
+            await embedding_manager.aget_embeddings_batch(unique_queries, config.embedding_model),
+            dtype=np.float32,
+        )
+        
+        if keyword_future is not None:
+            for result in await keyword_future:
                 if isinstance(result, Exception):
                     continue
-                for case in result:
-                    key = case.case_number
-                    if key not in all_cases or case.relevance_score > all_cases[key].relevance_score:
-                        all_cases[key] = case
-                        keyword_count += 1
+                hits.extend(result)
             
-            if keyword_count > 0:
-                print(f"   🔑 Found {keyword_count} keyword matches")
+            if hits:
+                logger.debug("Found %d keyword matches", len(hits))
         
-        # Step 2b: Vector search for semantic similarity
+        # Step 2b: Vector search for semantic similarity -
+        # one /points/search/batch request per court carries every query vector
         results_per_query = 30  # Get more candidates
-        tasks = []
-        for vector in vectors:
-            for court in courts:
-                tasks.append(self._search_court(court, vector, results_per_query))
         
-        print(f"🔍 Executing {len(tasks)} vector searches...")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.debug("Executing %d vector searches in %d batches", len(vectors) * len(courts), len(courts))
+        results = await asyncio.gather(
+            *[self.batch_search_collection(court, vectors, results_per_query) for court in courts],
+            return_exceptions=True,
+        )
         
-        # Merge vector results with keyword results
+        per_court = []
         for result in results:
             if isinstance(result, Exception):
-                print(f"⚠️ Search error: {result}")
+                logger.warning("Search error: %s", result)
                 continue
-            for case in result:
-                key = case.case_number
-                # Only add if not already found by keyword search (keyword has priority)
-                if key not in all_cases or case.relevance_score > all_cases[key].relevance_score:
-                    all_cases[key] = case
+            per_court.append(result)
+        
+        # Merge vector results with keyword results (query-major, as searched before batching)
+        for i in range(len(vectors)):
+            for batches in per_court:
+                hits.extend(batches[i] or [])
+        
+        all_cases = _best_per_case(hits)
         
-        print(f"📊 Found {len(all_cases)} unique cases (hybrid)")
+        logger.debug("Found %d unique cases (hybrid)", len(all_cases))
         
         if not all_cases:
             return []
         
         # Step 3: Apply entity-based boosting (fail-safe)
         if entities.has_entities():
-            print(f"🎯 Applying entity boosting...")
+            logger.debug("Applying entity boosting")
             for case in all_cases.values():
                 boost = calculate_boost(case, entities)
                 if boost > 1.0:
                     case.relevance_score *= boost
         
-        # Sort by (boosted) vector score
-        candidates = sorted(all_cases.values(), key=lambda x: x.relevance_score, reverse=True)
-        
-        # Take top candidates for cross-encoder reranking
-        top_candidates = candidates[:50]  # Rerank top 50
+        # Take top candidates by (boosted) vector score for cross-encoder reranking -
+        # partial selection, the tail below the cut is never sorted
+        top_candidates = heapq.nlargest(50, all_cases.values(), key=lambda x: x.relevance_score)  # Rerank top 50
         
         # Step 4: Cross-encoder reranking for precision
-        print(f"🎯 Cross-encoder reranking {len(top_candidates)} candidates...")
+        logger.debug("Cross-encoder reranking %d candidates", len(top_candidates))
         reranked = cross_encoder_manager.rerank(original_query, top_candidates, top_k=limit)
         
-        # CRITICAL: Fetch full_text from chunk 0 for chunked collections
-        print(f"📄 Fetching full text for {len(reranked)} final cases...")
-        enriched = await self._fetch_full_texts(reranked)
+        # Chunked collections return the matching chunk_text in subject - full
+        # text is fetched on demand by the frontend, not here
+        logger.info("Search complete: %d results", len(reranked))
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_top(reranked)
+        
+        return reranked
+    
+    async def search_collection(
+        self,
+        query: str,
+        source: DataSource = DataSource.GENERAL_COURTS,
+        limit: int = 10,
+    ) -> List[CaseResult]:
+        """
+        Direct vector search in a single collection (no query generation, no reranking).
+        
+        Results are served from the semantic query cache when a near-identical
+        question was searched recently.
+        """
+        config = get_configs().get(source)
+        if not config:
+            return []
+        
+        # float32 once - reused by the cache key, the query cache and the request body
+        vector = np.asarray(
+            await embedding_manager.aget_embedding(query, config.embedding_model), dtype=np.float32
+        )
+        cache = get_query_cache(config.name, config.cache_threshold)
+        
+        cached = cache.lookup(vector, limit)
+        if cached is not None:
+            logger.debug("Query cache hit (%s)", config.display_name)
+            return cached
+        
+        cases = await self._search_court(source, vector, limit)
+        if cases is None:
+            # Failed search - don't let near-duplicate questions reuse an empty result
+            return []
+        cases.sort(key=lambda x: x.relevance_score, reverse=True)
+        
+        await cache.update(vector, cases, limit)
+        return cases
+    
+    async def search_batch(
+        self,
+        query: str,
+        sources: List[DataSource],
+        limit: int = 10,
+    ) -> List[CaseResult]:
+        """
+        Direct vector search across several collections.
+        
+        The query is embedded once per embedding model and every collection
+        is searched concurrently with one batch request each.
+        """
+        courts: List[DataSource] = []
+        for source in sources:
+            if source == DataSource.ALL_COURTS:
+                expanded = _ALL_COURTS
+            else:
+                expanded = [source]
+            courts.extend(c for c in expanded if c not in courts and c in get_configs())
         
-        # Summary logging
-        print(f"\n{'─'*50}")
-        print(f"✅ SEARCH COMPLETE: {len(enriched)} results")
-        for i, case in enumerate(enriched, 1):
-            text_len = len(case.subject or "")
-            print(f"   [{i}] {case.case_number} ({case.court}) - {text_len:,} chars, score: {case.relevance_score:.3f}")
-        print(f"{'─'*50}\n")
+        if not courts:
+            return []
         
-        return enriched
+        # Collections share embedding models - embed once per model
+        model_names = list(dict.fromkeys(get_configs()[court].embedding_model for court in courts))
+        embedded = await asyncio.gather(
+            *[embedding_manager.aget_embedding(query, model_name) for model_name in model_names]
+        )
+        vectors: Dict[str, np.ndarray] = {
+            model_name: np.asarray(embedding, dtype=np.float32)
+            for model_name, embedding in zip(model_names, embedded)
+        }
+        
+        tasks = [
+            self.batch_search_collection(court, [vectors[get_configs()[court].embedding_model]], limit)
+            for court in courts
+        ]
+        results = await asyncio.gather(*tasks)
+        
+        cases = [case for batches in results for case in batches[0] or []]
+        cases.sort(key=lambda x: x.relevance_score, reverse=True)
+        return cases[:limit]
     
     async def _keyword_search_court(
         self, court: DataSource, entities: ExtractedEntities, limit: int = 20
@@ -354,205 +512,230 @@ class MultiSourceSearchEngine:
                 return []
             
             # Create a zero vector for filtered search (we only care about filter matches)
-            zero_vector = [0.0] * config.vector_size
+            zero_vector = np.zeros(config.vector_size, dtype=np.float32)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                for filter_info in filters:
-                    try:
-                        # Use vector search with filter instead of scroll
-                        # This is MUCH faster because it uses the HNSW index
-                        response = await client.post(
-                            f"{self.qdrant_url}/collections/{config.name}/points/search",
-                            headers=self.headers,
-                            json={
-                                "vector": zero_vector,
-                                "filter": {
-                                    "should": [filter_info["condition"]]
-                                },
-                                "limit": limit,
-                                "with_payload": True,
-                                "score_threshold": -999.0,  # Accept all scores since we're filtering
-                            },
-                        )
-                        
-                        if response.status_code != 200:
-                            continue
-                        
-                        results = response.json().get('result', [])
-                        
-                        for r in results:
-                            payload = r.get("payload", {})
-                            
-                            # Get text
-                            text = (
-                                payload.get("full_text") or
-                                payload.get("chunk_text") or
-                                payload.get("subject") or
-                                ""
-                            )
-                            
-                            # High score for keyword matches
-                            score = 0.95 if filter_info["type"] == "case_number" else 0.85
-                            
-                            cases.append(CaseResult(
-                                case_number=payload.get("case_number", "N/A"),
-                                court=config.display_name,
-                                judge=payload.get("judge"),
-                                subject=text,
-                                date_issued=payload.get("date") or payload.get("date_issued"),
-                                ecli=payload.get("ecli"),
-                                keywords=payload.get("keywords", []),
-                                legal_references=payload.get("legal_references", []),
-                                source_url=payload.get("source_url"),
-                                relevance_score=score,
-                                data_source=court.value,
-                            ))
-                    
-                    except Exception as e:
-                        print(f"   ⚠️ Keyword filter error: {e}")
-                        continue
+            # Use vector search with filter instead of scroll
+            # This is MUCH faster because it uses the HNSW index.
+            searches = [
+                {
+                    "vector": zero_vector,
+                    "filter": {
+                        "should": [filter_info["condition"]]
+                    },
+                    "limit": limit,
+                    "with_payload": True,
+                    "score_threshold": -999.0,  # Accept all scores since we're filtering
+                }
+                for filter_info in filters
+            ]
             
-            # Deduplicate - keep best score per case
-            seen: Dict[str, CaseResult] = {}
-            for case in cases:
-                if case.case_number not in seen or case.relevance_score > seen[case.case_number].relevance_score:
-                    seen[case.case_number] = case
+            # All filters go in one /points/search/batch request - one round trip per court
+            response = await qdrant_post(
+                config.batch_search_path, {"searches": searches}, timeout=self.timeout
+            )
             
-            return list(seen.values())
+            if response.status_code == 200:
+                batches = orjson.loads(response.content).get('result', [])
+            else:
+                # One bad filter fails the whole batch - search them one by one
+                # so only the failing filter is skipped
+                batches = await self._keyword_search_each(config, searches)
             
-        except Exception as e:
-            print(f"⚠️ Keyword search error (non-fatal): {e}")
-            return []
-    
-    async def _search_court(
-        self, court: DataSource, vector: List[float], limit: int
-    ) -> List[CaseResult]:
-        """Search a single court using vector similarity"""
-        config = get_configs().get(court)
-        if not config:
-            return []
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.qdrant_url}/collections/{config.name}/points/search",
-                    headers=self.headers,
-                    json={
-                        "vector": vector,
-                        "limit": limit,
-                        "with_payload": True,
-                    },
-                )
-                
-                if response.status_code != 200:
-                    return []
-                
-                results = response.json().get('result', [])
-                cases = []
+            for filter_info, results in zip(filters, batches):
+                # High score for keyword matches
+                score = 0.95 if filter_info["type"] == "case_number" else 0.85
                 
                 for r in results:
                     payload = r.get("payload", {})
-                    score = r.get("score", 0.0)
                     
-                    # Get whatever text we have - don't fail
+                    # Get text
                     text = (
-                        payload.get("full_text") or 
-                        payload.get("chunk_text") or 
-                        payload.get("subject") or 
+                        payload.get("full_text") or
+                        payload.get("chunk_text") or
+                        payload.get("subject") or
                         ""
                     )
                     
-                    cases.append(CaseResult(
+                    cases.append(CaseResult.model_construct(
                         case_number=payload.get("case_number", "N/A"),
                         court=config.display_name,
                         judge=payload.get("judge"),
                         subject=text,
                         date_issued=payload.get("date") or payload.get("date_issued"),
                         ecli=payload.get("ecli"),
-                        keywords=payload.get("keywords", []),
-                        legal_references=payload.get("legal_references", []),
+                        keywords=payload.get("keywords") or [],
+                        legal_references=payload.get("legal_references") or [],
                         source_url=payload.get("source_url"),
                         relevance_score=score,
                         data_source=court.value,
                     ))
-                
-                # Deduplicate chunks - keep best per case
-                seen: Dict[str, CaseResult] = {}
-                for case in cases:
-                    if case.case_number not in seen or case.relevance_score > seen[case.case_number].relevance_score:
-                        seen[case.case_number] = case
-                
-                return list(seen.values())
-                
+            
+            # Deduplicate - keep best score per case
+            return _dedupe_best(cases)
+            
         except Exception as e:
-            print(f"⚠️ {config.display_name}: {e}")
+            logger.warning("Keyword search error (non-fatal): %s", e)
             return []
     
-    async def _fetch_full_texts(self, cases: List[CaseResult]) -> List[CaseResult]:
+    async def _keyword_search_each(
+        self, config: CollectionConfig, searches: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Run filtered searches as separate requests - a failed one yields no hits"""
+        responses = await asyncio.gather(
+            *[qdrant_post(config.search_path, search, timeout=self.timeout) for search in searches],
+            return_exceptions=True,
+        )
+        
+        batches = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.warning("Keyword filter error: %s", response)
+                batches.append([])
+            elif response.status_code != 200:
+                logger.warning("Keyword filter error: HTTP %d", response.status_code)
+                batches.append([])
+            else:
+                batches.append(orjson.loads(response.content).get('result', []))
+        return batches
+    
+    @staticmethod
+    def _search_cache_key(config: CollectionConfig, limit: int, vector: List[float]) -> tuple:
+        digest = hashlib.blake2b(np.asarray(vector, dtype=np.float32).tobytes(), digest_size=16).digest()
+        return (config.name, limit, digest)
+    
+    async def _search_court(
+        self, court: DataSource, vector: List[float], limit: int
+    ) -> Optional[List[CaseResult]]:
         """
-        Fetch full_text from chunk 0 for chunked collections.
+        Search a single court using vector similarity.
         
-        Data structure:
-        - Chunked collections (3 courts): full_text is ONLY in chunk 0
-        - Legacy collection (general_courts): full_text is directly in payload
+        Identical searches within SEARCH_CACHE_TTL are answered from memory.
+        Callers get copies - search() rescales relevance_score in place.
+        Returns None when the search failed (as opposed to finding nothing).
         """
-        if not cases:
+        config = get_configs().get(court)
+        if not config:
             return []
         
-        # Group cases by collection type
-        chunked_cases = []
-        legacy_cases = []
+        cache_key = self._search_cache_key(config, limit, vector)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return [case.model_copy() for case in cached]
         
-        for case in cases:
-            source = DataSource(case.data_source) if case.data_source else DataSource.SUPREME_COURT
-            config = get_configs().get(source)
+        try:
+            response = await qdrant_post(
+                config.search_path,
+                {
+                    "vector": vector,
+                    "limit": limit,
+                    "with_payload": True,
+                },
+                timeout=self.timeout,
+            )
             
-            if config and config.uses_chunking:
-                chunked_cases.append((case, config))
-            else:
-                # Legacy collection already has full_text in subject
-                legacy_cases.append(case)
-        
-        # Legacy cases are already complete
-        enriched = list(legacy_cases)
-        
-        # Fetch full_text for chunked cases from chunk 0
-        if chunked_cases:
-            # Debug: show which collections we're fetching from
-            collections_used = set(config.name for _, config in chunked_cases)
-            print(f"   📄 Fetching full_text from chunk 0 for {len(chunked_cases)} cases from {collections_used}...")
-            tasks = [self._fetch_chunk0_full_text(case, config) for case, config in chunked_cases]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            if response.status_code != 200:
+                logger.warning("%s: HTTP %d", config.display_name, response.status_code)
+                return None
             
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    # On exception, still include the case with its original chunk_text
-                    original_case, _ = chunked_cases[i]
-                    print(f"   ⚠️ {original_case.case_number}: Fetch error, using original chunk ({len(original_case.subject or ''):,} chars)")
-                    enriched.append(original_case)
-                elif result:
-                    enriched.append(result)
-        
-        # Maintain original order by relevance score
-        case_order = {case.case_number: i for i, case in enumerate(cases)}
-        enriched.sort(key=lambda x: case_order.get(x.case_number, 999))
-        
-        return enriched
+            results = orjson.loads(response.content).get('result', [])
+            cases = self._results_to_cases(results, court, config)
+            cases.sort(key=lambda x: x.relevance_score, reverse=True)
+            self._search_cache.put(cache_key, cases)
+            return [case.model_copy() for case in cases]
+            
+        except Exception as e:
+            logger.warning("%s: %s", config.display_name, e)
+            return None
     
-    async def _fetch_chunk0_full_text(self, case: CaseResult, config: CollectionConfig) -> CaseResult:
+    def _results_to_cases(
+        self, results: List[Dict[str, Any]], court: DataSource, config: CollectionConfig
+    ) -> List[CaseResult]:
+        """
+        Convert Qdrant search hits to cases, keeping the best chunk per case.
+        
+        Payloads are our own indexed data, so cases are built with
+        model_construct (no per-field validation on the hot path).
         """
-        Fetch full_text from chunk 0 for a single case.
+        cases = []
         
-        The scroll endpoint with filters is SLOW because it scans all points.
-        Instead, we skip the full_text fetch entirely - the original chunk_text 
-        from the search is usually sufficient for the LLM context.
+        for r in results:
+            payload = r.get("payload", {})
+            score = r.get("score", 0.0)
+            
+            # Get whatever text we have - don't fail
+            text = (
+                payload.get("full_text") or 
+                payload.get("chunk_text") or 
+                payload.get("subject") or 
+                ""
+            )
+            
+            cases.append(CaseResult.model_construct(
+                case_number=payload.get("case_number", "N/A"),
+                court=config.display_name,
+                judge=payload.get("judge"),
+                subject=text,
+                date_issued=payload.get("date") or payload.get("date_issued"),
+                ecli=payload.get("ecli"),
+                keywords=payload.get("keywords") or [],
+                legal_references=payload.get("legal_references") or [],
+                source_url=payload.get("source_url"),
+                relevance_score=score,
+                data_source=court.value,
+            ))
+        
+        # Deduplicate chunks - keep best per case
+        return _dedupe_best(cases)
+    
+    async def batch_search_collection(
+        self, court: DataSource, vectors: List[List[float]], limit: int
+    ) -> List[Optional[List[CaseResult]]]:
+        """
+        Search a single court with several vectors in one request.
         
-        The full_text will be fetched on-demand when user clicks to view the case.
+        Uses Qdrant's /points/search/batch endpoint over the shared
+        connection pool, so N vectors cost one round trip instead of N.
+        Vectors answered by the search cache are left out of the request.
+        Returns one best-first case list (copies) per vector, or None for
+        vectors whose search failed.
         """
-        # For now, just return the case as-is
-        # The chunk_text from the search is already in case.subject
-        # Full text can be fetched on-demand via the frontend API
-        return case
+        config = get_configs().get(court)
+        if not config or not len(vectors):
+            return [[] for _ in vectors]
+        
+        keys = [self._search_cache_key(config, limit, vector) for vector in vectors]
+        batches: List[Optional[List[CaseResult]]] = [self._search_cache.get(key) for key in keys]
+        misses = [i for i, cases in enumerate(batches) if cases is None]
+        
+        if misses:
+            try:
+                response = await qdrant_post(
+                    config.batch_search_path,
+                    {
+                        "searches": [
+                            {"vector": vectors[i], "limit": limit, "with_payload": True}
+                            for i in misses
+                        ]
+                    },
+                    timeout=self.timeout,
+                )
+                
+                if response.status_code == 200:
+                    for i, results in zip(misses, orjson.loads(response.content).get('result', [])):
+                        cases = self._results_to_cases(results, court, config)
+                        cases.sort(key=lambda x: x.relevance_score, reverse=True)
+                        self._search_cache.put(keys[i], cases)
+                        batches[i] = cases
+                else:
+                    logger.warning("%s (batch): HTTP %d", config.display_name, response.status_code)
+                
+            except Exception as e:
+                logger.warning("%s (batch): %s", config.display_name, e)
+        
+        return [
+            [case.model_copy() for case in cases] if cases is not None else None
+            for cases in batches
+        ]
     
     # Backward compatibility
     async def multi_query_search(
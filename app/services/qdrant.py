@@ -0,0 +1,108 @@
+"""
+Qdrant HTTP Client - shared connection pool
+One keep-alive (HTTP/2) client reused across routes and scripts
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+import orjson
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_qdrant_client: Optional[httpx.AsyncClient] = None
+# Bounds in-flight requests across every caller (coalescer, search, search_batch)
+_qdrant_semaphore: Optional[asyncio.Semaphore] = None
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def get_qdrant_client() -> httpx.AsyncClient:
+    """Get or create the shared Qdrant client"""
+    global _qdrant_client
+
+    if _qdrant_client is None or _qdrant_client.is_closed:
+        _qdrant_client = httpx.AsyncClient(
+            base_url=settings.qdrant_url,
+            headers={"api-key": settings.QDRANT_API_KEY} if settings.QDRANT_API_KEY else {},
+            timeout=30.0,
+            http2=True,
+            # Keep every pooled connection alive - no re-handshakes after bursts
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.QDRANT_MAX_CONNECTIONS,
+                max_connections=settings.QDRANT_MAX_CONNECTIONS,
+            ),
+        )
+
+    return _qdrant_client
+
+
+def _is_server_error(response: httpx.Response) -> bool:
+    return response.status_code >= 500
+
+
+def _last_outcome(retry_state) -> httpx.Response:
+    # Out of attempts: hand back the last response (or raise its exception)
+    return retry_state.outcome.result()
+
+
+@retry(
+    stop=stop_after_attempt(settings.QDRANT_MAX_RETRIES),
+    # Full jitter - concurrent searches that fail together don't retry in lockstep
+    wait=wait_random_exponential(multiplier=0.5, max=30),
+    retry=retry_if_exception_type(httpx.TransportError) | retry_if_result(_is_server_error),
+    retry_error_callback=_last_outcome,
+)
+async def _post_content(path: str, content: bytes, kwargs: Dict[str, Any]) -> httpx.Response:
+    global _qdrant_semaphore
+
+    if _qdrant_semaphore is None:
+        _qdrant_semaphore = asyncio.Semaphore(settings.QDRANT_MAX_CONCURRENCY)
+    # Held per attempt, not across the retry backoff
+    async with _qdrant_semaphore:
+        return await get_qdrant_client().post(path, content=content, headers=_JSON_HEADERS, **kwargs)
+
+
+async def qdrant_post(
+    path: str, body: Dict[str, Any], timeout: Optional[float] = None
+) -> httpx.Response:
+    """
+    POST to Qdrant on the shared client, retrying transport errors and 5xx.
+    
+    The body is serialized once with orjson (numpy float32 vectors are
+    written directly, no list[float] detour) and the same bytes are
+    re-sent on every retry.
+    """
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    content = orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    return await _post_content(path, content, kwargs)
+
+
+async def warmup_qdrant_client(collections: List[str]) -> None:
+    """Open pooled connections (TCP + TLS) before the first real request arrives"""
+    client = get_qdrant_client()
+    results = await asyncio.gather(
+        *[client.get(f"/collections/{name}") for name in collections],
+        return_exceptions=True,
+    )
+    ok = sum(1 for r in results if not isinstance(r, Exception) and r.status_code == 200)
+    logger.info("Qdrant warmup: %d/%d collections reachable", ok, len(collections))
+
+
+async def close_qdrant_client() -> None:
+    """Close the shared Qdrant client (called on application shutdown)"""
+    global _qdrant_client
+
+    if _qdrant_client is not None:
+        await _qdrant_client.aclose()
+        _qdrant_client = None
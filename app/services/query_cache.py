@@ -0,0 +1,127 @@
+"""
+Query Cache - Semantic cache in front of Qdrant vector search
+
+Keeps past query vectors in an L2-normalized float32 matrix. A new query
+whose cosine similarity to a cached query is above the threshold reuses
+the cached cases and skips the Qdrant round-trip entirely. Lookup is one
+matrix-vector product plus masks, with no per-entry Python work.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.models import CaseResult
+
+
+class QVCache:
+    """Bounded similarity-aware LRU cache keyed by query embedding"""
+
+    def __init__(
+        self,
+        threshold: float = settings.QUERY_CACHE_THRESHOLD,
+        max_size: int = settings.QUERY_CACHE_MAX_SIZE,
+        ttl: float = settings.QUERY_CACHE_TTL,
+    ):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._matrix: Optional[np.ndarray] = None  # (max_size, dim) float32, rows L2-normalized
+        self._results: List[List[CaseResult]] = []
+        self._limits = np.zeros(max_size, dtype=np.int32)
+        self._inserted = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._size = 0
+        self._lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def lookup(self, vector: List[float], limit: int) -> Optional[List[CaseResult]]:
+        """Return cached cases for a semantically equivalent query, or None"""
+        if self._size == 0 or self._matrix is None:
+            self.misses += 1
+            return None
+
+        vec = self._normalize(vector)
+        if vec.shape[0] != self._matrix.shape[1]:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        n = self._size
+        # float32 storage - the product runs on the matrix as-is, no per-lookup copy
+        scores = self._matrix[:n] @ vec
+        # Expired entries and entries fetched with a smaller limit can't answer this query
+        valid = (now - self._inserted[:n] <= self.ttl) & (self._limits[:n] >= limit)
+        scores = np.where(valid, scores, -np.inf)
+
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        self._last_used[best] = now
+        self.hits += 1
+        return list(self._results[best][:limit])
+
+    async def update(self, vector: List[float], cases: List[CaseResult], limit: int) -> None:
+        """Insert query results, evicting the least recently used entry when full"""
+        vec = self._normalize(vector)
+
+        async with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, vec.shape[0]), dtype=np.float32)
+            elif vec.shape[0] != self._matrix.shape[1]:
+                return
+
+            now = time.monotonic()
+            if self._size < self.max_size:
+                slot = self._size
+                self._size += 1
+                self._results.append(cases)
+            else:
+                slot = int(np.argmin(self._last_used))
+                self._results[slot] = cases
+
+            self._matrix[slot] = vec
+            self._limits[slot] = limit
+            self._inserted[slot] = now
+            self._last_used[slot] = now
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_caches: Dict[str, QVCache] = {}
+
+
+def get_query_cache(collection: str, threshold: Optional[float] = None) -> QVCache:
+    """Get or create the cache for a collection"""
+    if collection not in _caches:
+        _caches[collection] = QVCache(
+            threshold=threshold if threshold is not None else settings.QUERY_CACHE_THRESHOLD
+        )
+    return _caches[collection]
+
+
+def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Stats for every collection cache"""
+    return {name: cache.stats() for name, cache in _caches.items()}
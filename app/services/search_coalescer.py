@@ -0,0 +1,142 @@
+"""
+Search Coalescer - Micro-batching for direct vector search
+
+Concurrent /search-cases requests arriving within a few milliseconds are
+collected into one batch: all questions are embedded in a single model
+call and all cache misses go to Qdrant as one /points/search/batch request.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from app.models import CaseResult
+from app.services.multi_source_search import (
+    DataSource,
+    embedding_manager,
+    get_configs,
+    multi_source_engine,
+)
+from app.services.query_cache import get_query_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _PendingSearch:
+    query: str
+    source: DataSource
+    limit: int
+    future: "asyncio.Future[List[CaseResult]]"
+
+
+class SearchCoalescer:
+    """Collects concurrent searches and runs them as one batch"""
+
+    def __init__(self, max_batch: int = 32, window: float = 0.005):
+        self.max_batch = max_batch
+        self.window = window  # Seconds to wait for more requests after the first
+        self._queue: Optional["asyncio.Queue[_PendingSearch]"] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()  # In-flight batches (strong refs)
+
+    def start(self) -> None:
+        """Start the background runner (called from the app lifespan)"""
+        if self._runner is None or self._runner.done():
+            self._queue = asyncio.Queue()
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        for task in list(self._batches):
+            task.cancel()
+
+    async def submit(self, query: str, source: DataSource, limit: int) -> List[CaseResult]:
+        """Queue a search and wait for its batch to complete"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingSearch(query, source, limit, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            batch = [item]
+
+            # Give concurrent requests a moment to join this batch
+            await asyncio.sleep(self.window)
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+
+            by_source: Dict[DataSource, List[_PendingSearch]] = {}
+            for pending in batch:
+                by_source.setdefault(pending.source, []).append(pending)
+
+            # Don't wait for the round trip - later arrivals start their own batch
+            for source, items in by_source.items():
+                task = asyncio.create_task(self._process_safe(source, items))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _process_safe(self, source: DataSource, items: List[_PendingSearch]) -> None:
+        try:
+            await self._process(source, items)
+        except Exception as e:
+            for pending in items:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+
+    async def _process(self, source: DataSource, items: List[_PendingSearch]) -> None:
+        config = get_configs()[source]
+        # float32 matrix - rows go straight into the Qdrant batch request
+        vectors = np.asarray(
+            await embedding_manager.aget_embeddings_batch(
+                [pending.query for pending in items], config.embedding_model
+            ),
+            dtype=np.float32,
+        )
+        cache = get_query_cache(config.name, config.cache_threshold)
+
+        misses = []
+        for pending, vector in zip(items, vectors):
+            cached = cache.lookup(vector, pending.limit)
+            if cached is not None:
+                # The caller may have gone away (cancelled future)
+                if not pending.future.done():
+                    pending.future.set_result(cached)
+            else:
+                misses.append((pending, vector))
+
+        if not misses:
+            return
+
+        logger.debug("Coalesced %d searches into one batch (%s)", len(misses), config.display_name)
+        limit = max(pending.limit for pending, _ in misses)
+        results = await multi_source_engine.batch_search_collection(
+            source, [vector for _, vector in misses], limit
+        )
+
+        for (pending, vector), cases in zip(misses, results):
+            if cases is None:
+                # Failed search - answer empty, but keep it out of the query cache
+                cases = []
+            else:
+                cases = cases[:pending.limit]
+                await cache.update(vector, cases, pending.limit)
+            if not pending.future.done():
+                pending.future.set_result(cases)
+
+
+# Global instance
+search_coalescer = SearchCoalescer()
@@ -1,5 +1,18 @@
+import operator
+
 from app.models import CaseResult
 
+# Public case fields returned by /search-cases (relevance_score is added rounded)
+CASE_FIELDS = ("case_number", "court", "subject", "date_issued")
+_get_case_fields = operator.attrgetter(*CASE_FIELDS)
+
+
+def case_to_dict(case: CaseResult) -> dict:
+    """Public view of a case for the direct search response (fields read in C by attrgetter)"""
+    result = dict(zip(CASE_FIELDS, _get_case_fields(case)))
+    result["relevance_score"] = round(case.relevance_score, 4)
+    return result
+
 
 def format_cases_for_context(cases: list[CaseResult]) -> str:
     """
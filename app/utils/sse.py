@@ -0,0 +1,12 @@
+"""
+Server-Sent Events helpers - frames are built as bytes with orjson
+"""
+import orjson
+
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+
+def sse_event(payload: dict) -> bytes:
+    """Encode one SSE data frame (StreamingResponse sends bytes without re-encoding)"""
+    return _SSE_PREFIX + orjson.dumps(payload) + _SSE_SUFFIX